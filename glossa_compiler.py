@@ -8,14 +8,24 @@ the language aimed at educational usage inside the bundled Tk IDE. Execution
 is intentionally single-pass and keeps the data structures simple so new
 students can follow the implementation.
 """
-import re
+import sys
 import math
-from dataclasses import dataclass
-from typing import List, Any, Optional, Tuple, Dict, Union
+import time
+import pickle
+import hashlib
+from array import array
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Any, Optional, Tuple, Dict, Union, Callable
 
 # -------------------- Lexer --------------------
 Token = Tuple[str, Any, int]  # (type, value, line)
-VarInfo = Tuple[str, Optional[List[int]]]  # (base type, dimensions or None)
+TokenColumns = Tuple[List[str], List[Any], array]  # (types, values, lines), one entry per token
+VarInfo = Tuple[int, Optional[List[int]]]  # (base type code, dimensions or None)
+
+# Base type codes stored in declarations, parameters and return types
+T_INT, T_REAL, T_CHAR, T_BOOL = 0, 1, 2, 3
 
 KEYWORDS = {
     "ΠΡΟΓΡΑΜΜΑ": "PROGRAM",
@@ -88,166 +98,256 @@ SYMBOLS = {
     ":": "COLON",
 }
 
-IDENT_RE = re.compile(
-    r"[A-Za-zΑ-Ωα-ωΆΈΉΊΌΎΏάέήίόύώϊΐϋΰ_][0-9A-Za-zΑ-Ωα-ωΆΈΉΊΌΎΏάέήίόύώϊΐϋΰ_]*"
+# Keyword -> (token type, token value), resolved once at import so the lexer
+# needs a single lookup per identifier. ΑΛΗΘΗΣ/ΨΕΥΔΗΣ carry their bool value.
+KEYWORD_TOKENS = {
+    kw: (ttype, True if ttype == "TRUE" else False if ttype == "FALSE" else kw)
+    for kw, ttype in KEYWORDS.items()
+}
+
+# Operators spelled with two characters; probed before the one-character table.
+TWO_CHAR = {sym: ttype for sym, ttype in SYMBOLS.items() if len(sym) == 2}
+
+IDENT_START = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_"
+    "ΆΈΉΊΌΎΏάέήίόύώϊΐϋΰ"
+    + "".join(map(chr, range(ord("Α"), ord("Ω") + 1)))
+    + "".join(map(chr, range(ord("α"), ord("ω") + 1)))
 )
-NUM_RE = re.compile(r"\d+(\.\d+)?")
-WS_RE = re.compile(r"[ \t]+")
+DIGITS = frozenset("0123456789")
+IDENT_CONT = IDENT_START | DIGITS
 
 class LexerError(Exception):
     """Raised when the lexer cannot match the current character sequence."""
     pass
 
-def lex(source: str) -> List[Token]:
-    """Return a token stream for *source* according to the Glossa language."""
-    tokens: List[Token] = []
+def lex(source: str) -> TokenColumns:
+    """Return the token stream for *source* according to the Glossa language.
+
+    The scanner is a hand-written state machine: each iteration looks at one
+    character, picks the token class it can start, and consumes the whole
+    token with a tight inner loop before slicing it out of *source* once.
+
+    Tokens are stored column-wise in three parallel sequences (types, values,
+    lines) rather than as one tuple per token; ``iter_tokens`` zips them back.
+    """
+    types: List[str] = []
+    values: List[Any] = []
+    lines = array("l")
     i = 0
     line = 1
     n = len(source)
+    # Bind hot globals and bound methods to locals once; inside the loop they
+    # are then plain fast-local loads rather than global/attribute lookups.
+    add_type = types.append
+    add_value = values.append
+    add_line = lines.append
+    kw_get = KEYWORD_TOKENS.get
+    symbols = SYMBOLS
+    two_get = TWO_CHAR.get
+    ident_start = IDENT_START
+    ident_cont = IDENT_CONT
+    digits = DIGITS
+    # Interned names make every later dict lookup by name an identity hit
+    intern = sys.intern
     while i < n:
         ch = source[i]
+        # Whitespace
+        if ch == " " or ch == "\t":
+            i += 1
+            continue
+        # Identifiers / keywords
+        if ch in ident_start:
+            j = i + 1
+            while j < n and source[j] in ident_cont:
+                j += 1
+            ident = source[i:j]
+            kw = kw_get(ident)
+            if kw is None:
+                add_type("ID")
+                add_value(intern(ident))
+                add_line(line)
+            else:
+                add_type(kw[0])
+                add_value(kw[1])
+                add_line(line)
+            i = j
+            continue
         # Newlines
         if ch == "\n":
             line += 1
             i += 1
             continue
-        # Comments: '!' to end of line
-        if ch == "!":
-            while i < n and source[i] != "\n":
+        # Symbols, two-character operators first
+        if ch in symbols:
+            two = source[i:i+2]
+            ttype = two_get(two)
+            if ttype is not None:
+                add_type(ttype)
+                add_value(two)
+                add_line(line)
+                i += 2
+            else:
+                add_type(symbols[ch])
+                add_value(ch)
+                add_line(line)
                 i += 1
             continue
-        # Whitespace
-        m = WS_RE.match(source, i)
-        if m:
-            i = m.end()
+        # Numbers
+        if ch in digits:
+            j = i + 1
+            while j < n and source[j] in digits:
+                j += 1
+            if j + 1 < n and source[j] == "." and source[j+1] in digits:
+                j += 2
+                while j < n and source[j] in digits:
+                    j += 1
+                add_type("NUMBER")
+                add_value(float(source[i:j]))
+                add_line(line)
+            else:
+                add_type("NUMBER")
+                add_value(int(source[i:j]))
+                add_line(line)
+            i = j
+            continue
+        # Comments: '!' to end of line
+        if ch == "!":
+            nl = source.find("\n", i)
+            i = n if nl == -1 else nl
             continue
         # Strings in double quotes or Greek quotes «...»
         if ch == '"' or ch == "«":
-            quote = ch
-            endq = '"' if quote == '"' else "»"
+            endq = '"' if ch == '"' else "»"
             i += 1
-            s = ""
+            end = source.find(endq, i)
+            if end == -1:
+                raise LexerError(f"Μη κλεισμένο αλφαριθμητικό στη γραμμή {line}")
+            if source.find("\\", i, end) == -1:
+                # No escapes before the closing quote: take the body as one slice
+                s = source[i:end]
+                i = end + 1
+                add_type("STRING")
+                add_value(s)
+                add_line(line)
+                line += s.count("\n")
+                continue
+            # Copy unescaped runs as slices and join once at the end
+            parts = []
+            start = i
             while i < n and source[i] != endq:
-                if source[i] == "\\":
-                    if i+1 < n:
-                        s += source[i+1]
-                        i += 2
-                        continue
-                s += source[i]
-                i += 1
-            if i >= n or source[i] != endq:
+                if source[i] == "\\" and i+1 < n:
+                    parts.append(source[start:i])
+                    parts.append(source[i+1])
+                    i += 2
+                    start = i
+                else:
+                    i += 1
+            if i >= n:
                 raise LexerError(f"Μη κλεισμένο αλφαριθμητικό στη γραμμή {line}")
+            parts.append(source[start:i])
+            s = "".join(parts)
             i += 1
-            tokens.append(("STRING", s, line))
-            continue
-        # Multi-char symbols first
-        matched = False
-        for sym in ["<-","<=",">=","<>"]:
-            if source.startswith(sym, i):
-                tokens.append((SYMBOLS[sym], sym, line))
-                i += len(sym)
-                matched = True
-                break
-        if matched:
-            continue
-        # Single-char symbols
-        if ch in SYMBOLS:
-            tokens.append((SYMBOLS[ch], ch, line))
-            i += 1
-            continue
-        # Numbers
-        m = NUM_RE.match(source, i)
-        if m:
-            text = m.group(0)
-            val = int(text) if "." not in text else float(text)
-            tokens.append(("NUMBER", val, line))
-            i = m.end()
-            continue
-        # Identifiers / keywords
-        m = IDENT_RE.match(source, i)
-        if m:
-            ident = m.group(0)
-            ttype = KEYWORDS.get(ident, "ID")
-            val = True if ttype == "TRUE" else False if ttype == "FALSE" else ident
-            tokens.append((ttype, val, line))
-            i = m.end()
+            add_type("STRING")
+            add_value(s)
+            add_line(line)
+            line += s.count("\n")
             continue
         raise LexerError(f"Μη αναγνωρίσιμο σύμβολο '{ch}' στη γραμμή {line}")
-    tokens.append(("EOF", None, line))
-    return tokens
+    add_type("EOF")
+    add_value(None)
+    add_line(line)
+    return types, values, lines
+
+def iter_tokens(tokens: TokenColumns):
+    """Yield the ``(type, value, line)`` tuples of a lexed token stream."""
+    return zip(*tokens)
 
 # -------------------- Parser / AST --------------------
 
-@dataclass
+# AST nodes use __slots__ where dataclasses support it (Python 3.10+): no
+# per-node __dict__, and attribute access goes through slot descriptors.
+_DC_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DC_SLOTS)
 class ASTNode:
     """Base AST node capturing the source line number."""
     line: int
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class Program(ASTNode):
     """Program header plus declarations and body statements."""
     name: str
-    const_decls: Dict[str, Tuple[str, Any]]  # name -> (type, value)
+    const_decls: Dict[str, Tuple[int, Any]]  # name -> (type code, value)
     var_decls: Dict[str, VarInfo]  # name -> (type, dimensions)
     statements: List[ASTNode]
     procedures: Dict[str, "ProcedureDef"]
     functions: Dict[str, "FunctionDef"]
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class Assign(ASTNode):
     """Assignment ``μεταβλητή <- έκφραση``."""
     name: str
     expr: ASTNode
     indices: Optional[List[ASTNode]] = None
+    slot: Optional[int] = None  # index into the owning Env, set by resolve_slots
+    # Set by resolve_slots when *expr* always yields the slot's own type
+    exact: bool = field(default=False, repr=False, compare=False)
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class Write(ASTNode):
     """Output command emitting one or more expressions."""
     exprs: List[ASTNode]
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class Read(ASTNode):
     """Input command reading values into variables."""
     targets: List[ASTNode]
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class ProcCall(ASTNode):
     """ΚΑΛΕΣΕ statement invoking a procedure."""
     name: str
     args: List[ASTNode]
+    # ProcedureDef resolved after parsing; None means look it up by name
+    target: Any = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class Return(ASTNode):
     """ΕΠΙΣΤΡΕΨΕ statement returning from a function."""
     expr: Optional[ASTNode]
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class If(ASTNode):
     """Conditional statement with optional else branch."""
     cond: ASTNode
     then_body: List[ASTNode]
     else_body: Optional[List[ASTNode]]
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class While(ASTNode):
     """ΟΣΟ loop guarded by a boolean expression."""
     cond: ASTNode
     body: List[ASTNode]
+    kernel: Any = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class Repeat(ASTNode):
     """ΑΡΧΗ_ΕΠΑΝΑΛΗΨΗΣ loop evaluated until condition becomes true."""
     body: List[ASTNode]
     cond: ASTNode
+    kernel: Any = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class Select(ASTNode):
     """ΕΠΙΛΕΞΕ multi-way branch with one or more ΠΕΡΙΠΤΩΣΗ blocks."""
     expr: ASTNode
     cases: List[Tuple[List[ASTNode], List[ASTNode]]]
     default: Optional[List[ASTNode]]
+    # Case value -> body when every case value is a literal, else None
+    table: Optional[Dict[Any, List[ASTNode]]] = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class For(ASTNode):
     """ΓΙΑ loop with start, end, optional step, and body."""
     var: str
@@ -255,107 +355,342 @@ class For(ASTNode):
     end: ASTNode
     step: Optional[ASTNode]
     body: List[ASTNode]
+    slot: Optional[int] = None
+    # Native translation built on first run: None = not tried, False = not eligible
+    kernel: Any = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class Parameter:
     """Subprogram parameter metadata."""
     name: str
-    type: str
+    type: int
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class ProcedureDef(ASTNode):
     """ΔΙΑΔΙΚΑΣΙΑ definition."""
     name: str
     params: List[Parameter]
     locals: Dict[str, VarInfo]
     statements: List[ASTNode]
+    # Call frame prototype built on the first call, see new_frame()
+    frame: Any = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class FunctionDef(ASTNode):
     """ΣΥΝΑΡΤΗΣΗ definition."""
     name: str
     params: List[Parameter]
     locals: Dict[str, VarInfo]
     statements: List[ASTNode]
-    return_type: str
+    return_type: int
+    frame: Any = field(default=None, repr=False, compare=False)
+    # Results keyed by the coerced arguments; a dict only for pure functions
+    memo: Optional[Dict[Tuple[Any, ...], Any]] = field(default=None, repr=False, compare=False)
 
 # Expressions
-@dataclass
+@dataclass(**_DC_SLOTS)
 class BinOp(ASTNode):
     """Binary operator node (π.χ. +, -, AND)."""
     op: str
     left: ASTNode
     right: ASTNode
 
-@dataclass
+# The parser builds one BinOp subclass per operator so the interpreter can
+# dispatch on the node class instead of comparing ``op`` strings.
+@dataclass(**_DC_SLOTS)
+class AddOp(BinOp):
+    """Addition (+)."""
+
+@dataclass(**_DC_SLOTS)
+class SubOp(BinOp):
+    """Subtraction (-)."""
+
+@dataclass(**_DC_SLOTS)
+class MulOp(BinOp):
+    """Multiplication (*)."""
+
+@dataclass(**_DC_SLOTS)
+class DivOp(BinOp):
+    """Real division (/)."""
+
+@dataclass(**_DC_SLOTS)
+class IntDivOp(BinOp):
+    """Integer division (DIV)."""
+
+@dataclass(**_DC_SLOTS)
+class ModOp(BinOp):
+    """Remainder (MOD, %)."""
+
+@dataclass(**_DC_SLOTS)
+class EqOp(BinOp):
+    """Equality (=)."""
+
+@dataclass(**_DC_SLOTS)
+class NeOp(BinOp):
+    """Inequality (<>)."""
+
+@dataclass(**_DC_SLOTS)
+class LtOp(BinOp):
+    """Less than (<)."""
+
+@dataclass(**_DC_SLOTS)
+class LeOp(BinOp):
+    """Less than or equal (<=)."""
+
+@dataclass(**_DC_SLOTS)
+class GtOp(BinOp):
+    """Greater than (>)."""
+
+@dataclass(**_DC_SLOTS)
+class GeOp(BinOp):
+    """Greater than or equal (>=)."""
+
+@dataclass(**_DC_SLOTS)
+class AndOp(BinOp):
+    """Logical conjunction (ΚΑΙ)."""
+
+@dataclass(**_DC_SLOTS)
+class OrOp(BinOp):
+    """Logical disjunction (Η)."""
+
+# Chosen by resolve_slots when both operands are statically ΑΚΕΡΑΙΑ, which
+# makes the int() conversions of the generic handlers unnecessary.
+@dataclass(**_DC_SLOTS)
+class IntDivIntOp(IntDivOp):
+    """Integer division of two integers."""
+
+@dataclass(**_DC_SLOTS)
+class ModIntOp(ModOp):
+    """Remainder of two integers."""
+
+# Also chosen by resolve_slots: the right operand is a numeric literal, so
+# the handler reads its value instead of dispatching on it.
+@dataclass(**_DC_SLOTS)
+class AddLitOp(AddOp):
+    """Addition of a literal."""
+
+@dataclass(**_DC_SLOTS)
+class SubLitOp(SubOp):
+    """Subtraction of a literal."""
+
+@dataclass(**_DC_SLOTS)
+class MulLitOp(MulOp):
+    """Multiplication by a literal."""
+
+@dataclass(**_DC_SLOTS)
+class IntDivIntLitOp(IntDivIntOp):
+    """Integer division of an integer by a non-zero integer literal."""
+
+@dataclass(**_DC_SLOTS)
+class ModIntLitOp(ModIntOp):
+    """Remainder of an integer by a non-zero integer literal."""
+
+@dataclass(**_DC_SLOTS)
+class EqLitOp(EqOp):
+    """Equality with a literal."""
+
+@dataclass(**_DC_SLOTS)
+class NeLitOp(NeOp):
+    """Inequality with a literal."""
+
+@dataclass(**_DC_SLOTS)
+class LtLitOp(LtOp):
+    """Less than a literal."""
+
+@dataclass(**_DC_SLOTS)
+class LeLitOp(LeOp):
+    """Less than or equal to a literal."""
+
+@dataclass(**_DC_SLOTS)
+class GtLitOp(GtOp):
+    """Greater than a literal."""
+
+@dataclass(**_DC_SLOTS)
+class GeLitOp(GeOp):
+    """Greater than or equal to a literal."""
+
+BINOP_CLASSES = {
+    "PLUS": AddOp, "MINUS": SubOp, "MUL": MulOp, "DIVIDE": DivOp,
+    "DIV": IntDivOp, "MOD": ModOp, "MOD_SYM": ModOp,
+    "EQ": EqOp, "NE": NeOp, "LT": LtOp, "LE": LeOp, "GT": GtOp, "GE": GeOp,
+    "AND": AndOp, "OR": OrOp,
+}
+
+@dataclass(**_DC_SLOTS)
 class UnOp(ASTNode):
     """Unary operator node (π.χ. NOT, unary minus)."""
     op: str
     expr: ASTNode
 
-@dataclass
+# Likewise one UnOp subclass per unary operator
+@dataclass(**_DC_SLOTS)
+class NegOp(UnOp):
+    """Unary minus (-)."""
+
+@dataclass(**_DC_SLOTS)
+class PosOp(UnOp):
+    """Unary plus (+)."""
+
+@dataclass(**_DC_SLOTS)
+class NotOp(UnOp):
+    """Logical negation (ΟΧΙ)."""
+
+UNOP_CLASSES = {"MINUS": NegOp, "PLUS": PosOp, "NOT": NotOp}
+
+@dataclass(**_DC_SLOTS)
 class Var(ASTNode):
     """Variable reference expression."""
     name: str
+    slot: Optional[int] = None
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class ArrayRef(ASTNode):
     """Array element reference expression."""
     name: str
     indices: List[ASTNode]
+    slot: Optional[int] = None
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class Number(ASTNode):
     """Numeric literal."""
     value: Union[int,float]
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class String(ASTNode):
     """String literal."""
     value: str
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class Bool(ASTNode):
     """Boolean literal."""
     value: bool
 
-@dataclass
+@dataclass(**_DC_SLOTS)
 class FuncCall(ASTNode):
     """Function call returning a value."""
     name: str
     args: List[ASTNode]
+    # User FunctionDef resolved after parsing; None for built-ins and unknown names
+    target: Any = field(default=None, repr=False, compare=False)
+
+# Every concrete node class gets a small integer OP; the interpreter indexes
+# its handler tuples with ``node.OP`` instead of testing the node's type.
+NODE_TYPES = (
+    Program, Assign, Write, Read, ProcCall, Return, If, While, Repeat, Select,
+    For, ProcedureDef, FunctionDef, BinOp, UnOp, Var, ArrayRef, Number,
+    String, Bool, FuncCall,
+    AddOp, SubOp, MulOp, DivOp, IntDivOp, ModOp, EqOp, NeOp, LtOp, LeOp,
+    GtOp, GeOp, AndOp, OrOp, IntDivIntOp, ModIntOp, NegOp, PosOp, NotOp,
+    AddLitOp, SubLitOp, MulLitOp, IntDivIntLitOp, ModIntLitOp, EqLitOp, NeLitOp,
+    LtLitOp, LeLitOp, GtLitOp, GeLitOp,
+)
+for _op, _cls in enumerate(NODE_TYPES):
+    _cls.OP = _op
+ASTNode.OP = len(NODE_TYPES)  # anything else maps to the trailing "unsupported" entry
+
+def dispatch_table(handlers: Dict[type, Any], unsupported: Any) -> Tuple[Any, ...]:
+    """Lay out *handlers* (keyed by node class) as a tuple indexed by ``OP``."""
+    return tuple(handlers.get(cls, unsupported) for cls in NODE_TYPES) + (unsupported,)
 
 class ParseError(Exception):
     """Raised when parsing fails due to invalid token ordering."""
     pass
 
+# Binding power of the binary operators; higher binds tighter.
+PREC = {
+    "OR": 1,
+    "AND": 2,
+    "EQ": 3, "NE": 3, "LT": 3, "LE": 3, "GT": 3, "GE": 3,
+    "PLUS": 4, "MINUS": 4,
+    "MUL": 5, "DIVIDE": 5, "DIV": 5, "MOD": 5, "MOD_SYM": 5,
+}
+CMP_PREC = PREC["EQ"]
+
+LITERAL_TYPES = (Number, String, Bool)
+
+def case_table(cases: List[Tuple[List[ASTNode], List[ASTNode]]]) -> Optional[Dict[Any, List[ASTNode]]]:
+    """Map each literal case value to its body, or return None if any value is not a literal.
+
+    The first case listing a value wins, as with the linear scan.
+    """
+    table: Dict[Any, List[ASTNode]] = {}
+    for values, body in cases:
+        for val_expr in values:
+            if not isinstance(val_expr, LITERAL_TYPES):
+                return None
+            table.setdefault(val_expr.value, body)
+    return table
+
+def fold_constant(node: Union[BinOp, UnOp]) -> ASTNode:
+    """Replace an operator applied to literals by the literal it evaluates to.
+
+    The value is computed by the interpreter's own handler, so folding never
+    changes semantics; expressions that would fail at runtime (division by
+    zero, mismatched operand types) are left for the runtime to report.
+    """
+    if isinstance(node, BinOp):
+        if not (isinstance(node.left, LITERAL_TYPES) and isinstance(node.right, LITERAL_TYPES)):
+            return node
+        # Keep string repetition out of the parser; it can grow arbitrarily
+        if type(node) is MulOp and (type(node.left) is String or type(node.right) is String):
+            return node
+    elif not isinstance(node.expr, LITERAL_TYPES):
+        return node
+    try:
+        value = _EXPR_DISPATCH[node.OP](node, None, None)
+    except Exception:
+        return node
+    literal = literal_node(value, node.line)
+    return node if literal is None else literal
+
+def literal_node(value: Any, line: int) -> Optional[ASTNode]:
+    """Return the literal node holding *value*, or None for a non-scalar value."""
+    if isinstance(value, bool):
+        return Bool(line=line, value=value)
+    if isinstance(value, (int, float)):
+        return Number(line=line, value=value)
+    if isinstance(value, str):
+        return String(line=line, value=value)
+    return None
+
+# Type keyword token -> base type code
+TYPE_CODES = {"TYPE_INT": T_INT, "TYPE_REAL": T_REAL, "TYPE_CHAR": T_CHAR, "TYPE_BOOL": T_BOOL}
+
 class Parser:
     """Recursive-descent parser turning tokens into an AST."""
 
-    def __init__(self, tokens: List[Token]):
-        """Store the token list and initialise the cursor."""
-        self.tokens = tokens
+    def __init__(self, tokens: TokenColumns):
+        """Store the token columns and initialise the cursor."""
+        self.types, self.values, self.lines = tokens
         self.pos = 0
 
     def current(self) -> Token:
         """Return the token currently under the parser cursor."""
-        return self.tokens[self.pos]
+        pos = self.pos
+        return (self.types[pos], self.values[pos], self.lines[pos])
+
+    def _peek(self) -> str:
+        """Return the type of the current token without consuming it."""
+        return self.types[self.pos]
 
     def accept(self, *types: str) -> Optional[Token]:
         """Consume and return the current token if its type matches."""
-        ttype, val, line = self.current()
+        pos = self.pos
+        ttype = self.types[pos]
         if ttype in types:
-            self.pos += 1
-            return (ttype, val, line)
+            self.pos = pos + 1
+            return (ttype, self.values[pos], self.lines[pos])
         return None
 
     def expect(self, *types: str) -> Token:
         """Consume the current token or raise if it is not of the expected type."""
-        tok = self.accept(*types)
-        if not tok:
-            ttype, val, line = self.current()
-            raise ParseError(f"Συντακτικό λάθος στη γραμμή {line}: αναμενόταν {' ή '.join(types)}, βρέθηκε {ttype}")
-        return tok
+        pos = self.pos
+        ttype = self.types[pos]
+        if ttype in types:
+            self.pos = pos + 1
+            return (ttype, self.values[pos], self.lines[pos])
+        line = self.lines[pos]
+        raise ParseError(f"Συντακτικό λάθος στη γραμμή {line}: αναμενόταν {' ή '.join(types)}, βρέθηκε {ttype}")
 
     def parse(self) -> Program:
         """Parse an entire Glossa program and return the AST."""
@@ -369,8 +704,8 @@ class Parser:
         stmts: List[ASTNode] = []
         procedures: Dict[str, ProcedureDef] = {}
         functions: Dict[str, FunctionDef] = {}
-        while self.current()[0] != "END_PROGRAM":
-            token = self.current()[0]
+        while self._peek() != "END_PROGRAM":
+            token = self._peek()
             if token == "PROC":
                 proc = self.parse_procedure_def()
                 if proc.name in procedures or proc.name in functions:
@@ -385,8 +720,8 @@ class Parser:
                 continue
             stmts.append(self.parse_statement())
         self.expect("END_PROGRAM")
-        while self.current()[0] != "EOF":
-            token = self.current()[0]
+        while self._peek() != "EOF":
+            token = self._peek()
             if token == "PROC":
                 proc = self.parse_procedure_def()
                 if proc.name in procedures or proc.name in functions:
@@ -401,12 +736,15 @@ class Parser:
                 continue
             raise ParseError("Απροσδόκητο περιεχόμενο μετά το ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ")
         self.expect("EOF")
-        return Program(line=line, name=name, const_decls=const_decls, var_decls=var_decls, statements=stmts, procedures=procedures, functions=functions)
+        prog = Program(line=line, name=name, const_decls=const_decls, var_decls=var_decls, statements=stmts, procedures=procedures, functions=functions)
+        resolve_slots(prog)
+        return prog
 
     def parse_statements(self, until: Tuple[str, ...]) -> List[ASTNode]:
         """Collect statements until one of the tokens listed in *until* is met."""
         res: List[ASTNode] = []
-        while self.current()[0] not in until:
+        types = self.types
+        while types[self.pos] not in until:
             res.append(self.parse_statement())
         return res
 
@@ -435,7 +773,9 @@ class Parser:
     def parse_index_list(self) -> List[ASTNode]:
         """Parse one or more comma-separated index expressions."""
         indices = [self.parse_expr()]
-        while self.accept("COMMA"):
+        types = self.types
+        while types[self.pos] == "COMMA":
+            self.pos += 1
             indices.append(self.parse_expr())
         return indices
 
@@ -449,13 +789,13 @@ class Parser:
             return ArrayRef(line=line, name=name, indices=indices)
         return Var(line=line, name=name)
 
-    def parse_constants_section(self) -> Dict[str, Tuple[str, Any]]:
+    def parse_constants_section(self) -> Dict[str, Tuple[int, Any]]:
         """Parse ΣΤΑΘΕΡΕΣ section if present."""
-        const_decls: Dict[str, Tuple[str, Any]] = {}
+        const_decls: Dict[str, Tuple[int, Any]] = {}
         if not self.accept("CONSTS"):
             return const_decls
         type_tokens = ("TYPE_INT","TYPE_REAL","TYPE_CHAR","TYPE_BOOL")
-        while self.current()[0] in type_tokens:
+        while self._peek() in type_tokens:
             type_tok = self.expect(*type_tokens)
             self.expect("COLON")
             while True:
@@ -480,7 +820,7 @@ class Parser:
                     value = -num_tok[1]
                 else:
                     raise ParseError(f"Αναμενόμενη σταθερή τιμή στη γραμμή {val_tok[2]}")
-                const_decls[id_tok[1]] = (type_tok[0], value)
+                const_decls[id_tok[1]] = (TYPE_CODES[type_tok[0]], value)
                 if not self.accept("COMMA"):
                     break
         return const_decls
@@ -489,23 +829,23 @@ class Parser:
         decls: Dict[str, VarInfo] = {}
         type_tokens = ("TYPE_INT","TYPE_REAL","TYPE_CHAR","TYPE_BOOL")
         while True:
-            section = self.current()[0]
+            section = self._peek()
             if section == "VARS":
                 self.pos += 1
-                while self.current()[0] in type_tokens:
+                while self._peek() in type_tokens:
                     type_tok = self.expect(*type_tokens)
                     self.expect("COLON")
                     while True:
                         id_tok = self.expect("ID")
                         if id_tok[1] in decls:
                             raise ParseError(f"Η μεταβλητή '{id_tok[1]}' έχει ήδη δηλωθεί")
-                        decls[id_tok[1]] = (type_tok[0], None)
+                        decls[id_tok[1]] = (TYPE_CODES[type_tok[0]], None)
                         if not self.accept("COMMA"):
                             break
                 continue
             if section == "ARRAYS":
                 self.pos += 1
-                while self.current()[0] in type_tokens:
+                while self._peek() in type_tokens:
                     type_tok = self.expect(*type_tokens)
                     self.expect("COLON")
                     while True:
@@ -513,7 +853,7 @@ class Parser:
                         if id_tok[1] in decls:
                             raise ParseError(f"Η μεταβλητή '{id_tok[1]}' έχει ήδη δηλωθεί")
                         dims = self.parse_array_dimensions()
-                        decls[id_tok[1]] = (type_tok[0], dims)
+                        decls[id_tok[1]] = (TYPE_CODES[type_tok[0]], dims)
                         if not self.accept("COMMA"):
                             break
                 continue
@@ -532,7 +872,7 @@ class Parser:
             type_tok = self.expect("TYPE_INT","TYPE_REAL","TYPE_CHAR","TYPE_BOOL")
             if any(p.name == pname for p in params):
                 raise ParseError(f"Η παράμετρος '{pname}' έχει ήδη δηλωθεί")
-            params.append(Parameter(name=pname, type=type_tok[0]))
+            params.append(Parameter(name=pname, type=TYPE_CODES[type_tok[0]]))
             if self.accept("COMMA"):
                 continue
             self.expect("RPAREN")
@@ -541,10 +881,13 @@ class Parser:
 
     def parse_argument_list(self) -> List[ASTNode]:
         args: List[ASTNode] = []
-        if self.accept("RPAREN"):
+        if self.types[self.pos] == "RPAREN":
+            self.pos += 1
             return args
         args.append(self.parse_expr())
-        while self.accept("COMMA"):
+        types = self.types
+        while types[self.pos] == "COMMA":
+            self.pos += 1
             args.append(self.parse_expr())
         self.expect("RPAREN")
         return args
@@ -566,7 +909,7 @@ class Parser:
         name_tok = self.expect("ID")
         params = self.parse_parameter_list()
         self.expect("COLON")
-        ret_type = self.expect("TYPE_INT","TYPE_REAL","TYPE_CHAR","TYPE_BOOL")[0]
+        ret_type = TYPE_CODES[self.expect("TYPE_INT","TYPE_REAL","TYPE_CHAR","TYPE_BOOL")[0]]
         locals_decl = self.parse_variable_sections()
         self.expect("BEGIN")
         body = self.parse_statements(until=("END_FUNC",))
@@ -575,17 +918,22 @@ class Parser:
 
     def parse_statement(self) -> ASTNode:
         """Parse a single statement based on the next token."""
-        ttype, val, line = self.current()
+        pos = self.pos
+        ttype, val, line = self.types[pos], self.values[pos], self.lines[pos]
         if ttype == "WRITE":
             self.pos += 1
             exprs = [self.parse_expr()]
-            while self.accept("COMMA"):
+            types = self.types
+            while types[self.pos] == "COMMA":
+                self.pos += 1
                 exprs.append(self.parse_expr())
             return Write(line=line, exprs=exprs)
         if ttype == "READ":
             self.pos += 1
             targets = [self.parse_read_target()]
-            while self.accept("COMMA"):
+            types = self.types
+            while types[self.pos] == "COMMA":
+                self.pos += 1
                 targets.append(self.parse_read_target())
             return Read(line=line, targets=targets)
         if ttype == "CALL":
@@ -627,7 +975,7 @@ class Parser:
             cases: List[Tuple[List[ASTNode], List[ASTNode]]] = []
             default_body: Optional[List[ASTNode]] = None
             while True:
-                next_type = self.current()[0]
+                next_type = self._peek()
                 if next_type == "END_SELECT":
                     break
                 self.expect("CASE")
@@ -636,7 +984,9 @@ class Parser:
                     default_body = self.parse_statements(until=("CASE","END_SELECT"))
                 else:
                     values: List[ASTNode] = [self.parse_expr()]
-                    while self.accept("COMMA"):
+                    types = self.types
+                    while types[self.pos] == "COMMA":
+                        self.pos += 1
                         values.append(self.parse_expr())
                     self.expect("COLON")
                     body = self.parse_statements(until=("CASE","END_SELECT"))
@@ -644,7 +994,8 @@ class Parser:
                     continue
                 # after default body, consume remaining cases? spec says default likely last
             self.expect("END_SELECT")
-            return Select(line=line, expr=expr, cases=cases, default=default_body)
+            return Select(line=line, expr=expr, cases=cases, default=default_body,
+                          table=case_table(cases))
         if ttype == "FOR":
             self.pos += 1
             varname = self.expect("ID")[1]
@@ -662,7 +1013,8 @@ class Parser:
             self.pos += 1
             name = val
             indices = None
-            if self.accept("LBRACKET"):
+            if self.types[self.pos] == "LBRACKET":
+                self.pos += 1
                 indices = self.parse_index_list()
                 self.expect("RBRACKET")
             self.expect("ASSIGN")
@@ -670,77 +1022,48 @@ class Parser:
             return Assign(line=line, name=name, expr=expr, indices=indices)
         raise ParseError(f"Άγνωστη εντολή στη γραμμή {line}: {ttype}")
 
-    def parse_expr(self) -> ASTNode:
-        """Parse an expression following Glossa precedence rules."""
-        return self.parse_or()
+    def parse_expr(self, min_prec: int = 1) -> ASTNode:
+        """Parse an expression whose operators bind at least as tightly as *min_prec*.
 
-    def parse_or(self) -> ASTNode:
-        """Parse OR chains."""
-        node = self.parse_and()
-        while self.accept("OR"):
-            rhs = self.parse_and()
-            node = BinOp(op="OR", left=node, right=rhs, line=node.line)
-        return node
-
-    def parse_and(self) -> ASTNode:
-        """Parse AND chains."""
-        node = self.parse_not()
-        while self.accept("AND"):
-            rhs = self.parse_not()
-            node = BinOp(op="AND", left=node, right=rhs, line=node.line)
-        return node
-
-    def parse_not(self) -> ASTNode:
-        """Parse unary NOT expressions."""
-        if self.accept("NOT"):
-            expr = self.parse_not()
-            return UnOp(op="NOT", expr=expr, line=expr.line)
-        return self.parse_cmp()
-
-    def parse_cmp(self) -> ASTNode:
-        """Parse comparison operators."""
-        node = self.parse_add()
-        t = self.accept("EQ","NE","LT","LE","GT","GE")
-        if t:
-            op = t[0]
-            rhs = self.parse_add()
-            node = BinOp(op=op, left=node, right=rhs, line=node.line)
-        return node
-
-    def parse_add(self) -> ASTNode:
-        """Parse addition/subtraction expressions."""
-        node = self.parse_mul()
-        while True:
-            t = self.accept("PLUS","MINUS")
-            if not t: break
-            op = t[0]
-            rhs = self.parse_mul()
-            node = BinOp(op=op, left=node, right=rhs, line=node.line)
-        return node
-
-    def parse_mul(self) -> ASTNode:
-        """Parse multiplication/division expressions."""
-        node = self.parse_unary()
+        Binary operators are handled by a single precedence-climbing loop driven
+        by ``PREC``. ``ΟΧΙ`` may only start an operand at comparison level or
+        looser, and comparisons do not chain: once one has been consumed (or the
+        operand was negated), only ``ΚΑΙ``/``Η`` may follow.
+        """
+        if self.types[self.pos] == "NOT" and min_prec <= CMP_PREC:
+            self.pos += 1
+            expr = self.parse_expr(CMP_PREC)
+            node = fold_constant(NotOp(op="NOT", expr=expr, line=expr.line))
+            closed = True
+        else:
+            node = self.parse_unary()
+            closed = False
+        types = self.types
         while True:
-            t = self.accept("MUL","DIVIDE","DIV","MOD","MOD_SYM")
-            if not t: break
-            op = t[0]
-            rhs = self.parse_unary()
-            node = BinOp(op=op, left=node, right=rhs, line=node.line)
+            op = types[self.pos]
+            prec = PREC.get(op, 0)
+            if prec < min_prec or (closed and prec >= CMP_PREC):
+                break
+            self.pos += 1
+            rhs = self.parse_expr(prec + 1)
+            node = fold_constant(BINOP_CLASSES[op](op=op, left=node, right=rhs, line=node.line))
+            if prec <= CMP_PREC:
+                closed = True
         return node
 
     def parse_unary(self) -> ASTNode:
         """Parse unary plus/minus."""
-        t = self.accept("MINUS","PLUS")
-        if t:
-            op = t[0]
+        op = self.types[self.pos]
+        if op == "MINUS" or op == "PLUS":
+            self.pos += 1
             expr = self.parse_unary()
-            return UnOp(op=op, expr=expr, line=expr.line)
+            return fold_constant(UNOP_CLASSES[op](op=op, expr=expr, line=expr.line))
         return self.parse_primary()
 
     def parse_primary(self) -> ASTNode:
         """Parse literals, identifiers, or parenthesised expressions."""
-        ttype, val, line = self.current()
+        pos = self.pos
+        ttype, val, line = self.types[pos], self.values[pos], self.lines[pos]
         if ttype == "NUMBER":
             self.pos += 1
             return Number(line=line, value=val)
@@ -753,10 +1076,13 @@ class Parser:
         if ttype == "ID":
             self.pos += 1
             name = val
-            if self.accept("LPAREN"):
+            next_type = self.types[self.pos]
+            if next_type == "LPAREN":
+                self.pos += 1
                 args = self.parse_argument_list()
                 return FuncCall(line=line, name=name, args=args)
-            if self.accept("LBRACKET"):
+            if next_type == "LBRACKET":
+                self.pos += 1
                 indices = self.parse_index_list()
                 self.expect("RBRACKET")
                 return ArrayRef(line=line, name=name, indices=indices)
@@ -768,8 +1094,364 @@ class Parser:
             return node
         raise ParseError(f"Συντακτικό λάθος στη γραμμή {line}: αναμενόταν έκφραση, βρέθηκε {ttype}")
 
+# -------------------- Name resolution --------------------
+
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+def node_fields(cls: type) -> Tuple[str, ...]:
+    """Return the names of the fields of node class *cls* that may hold nodes.
+
+    Derived fields filled in after parsing (declared with ``compare=False``,
+    such as cached kernels or resolved call targets) are not part of the tree.
+    """
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls) if f.name != "line" and f.compare)
+    return names
+
+def iter_nodes(node: ASTNode):
+    """Yield *node* and every AST node nested below it, parents first."""
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, ASTNode):
+            yield item
+            for name in node_fields(type(item)):
+                child = getattr(item, name)
+                if isinstance(child, (ASTNode, list, tuple)):
+                    stack.append(child)
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+
+def scope_layout(var_types: Dict[str, VarInfo], const_decls: Dict[str, Tuple[int, Any]]) -> Dict[str, int]:
+    """Assign every name of a scope its slot: constants first, then variables."""
+    layout: Dict[str, int] = {}
+    for name in const_decls:
+        layout.setdefault(name, len(layout))
+    for name in var_types:
+        layout.setdefault(name, len(layout))
+    return layout
+
+def subprogram_types(sub: Union["ProcedureDef", "FunctionDef"]) -> Dict[str, VarInfo]:
+    """Return the variable table of a subprogram frame (locals plus parameters)."""
+    local_types: Dict[str, VarInfo] = dict(sub.locals)
+    for param in sub.params:
+        local_types[param.name] = (param.type, None)
+    return local_types
+
+def _resolve_calls(stmts: List[ASTNode], prog: Program):
+    for node in iter_nodes(stmts):
+        kind = type(node)
+        if kind is ProcCall:
+            node.target = prog.procedures.get(node.name)
+        elif kind is FuncCall and node.name not in BUILTIN_FUNCTIONS:
+            # Built-ins take precedence over user functions of the same name
+            node.target = prog.functions.get(node.name)
+
+def _resolve_body(stmts: List[ASTNode], var_types: Dict[str, VarInfo],
+                  const_decls: Dict[str, Tuple[int, Any]]):
+    layout = scope_layout(var_types, const_decls)
+    arrays = {name for name, (_, dims) in var_types.items() if dims is not None}
+    # Names a plain Var may read, and names a scalar assignment may write
+    readable = {name for name in layout if name not in arrays}
+    writable = {name for name in readable if name not in const_decls}
+    arrays -= set(const_decls)
+    for node in iter_nodes(stmts):
+        kind = type(node)
+        if kind is Var:
+            node.slot = layout[node.name] if node.name in readable else None
+        elif kind is ArrayRef:
+            node.slot = layout[node.name] if node.name in arrays else None
+        elif kind is Assign:
+            targets = writable if node.indices is None else arrays
+            node.slot = layout[node.name] if node.name in targets else None
+        elif kind is For:
+            node.slot = layout[node.var] if node.var in writable else None
+
+_INT_PRESERVING = (AddOp, SubOp, MulOp)
+
+def static_type(node: ASTNode, scalar_types: Dict[str, int]) -> Optional[int]:
+    """Return the base type code *node* always evaluates to, or None if unknown.
+
+    *scalar_types* maps the names declared in the scope to their base types;
+    only slot-resolved references are trusted, since stored values are always
+    coerced to the declared type.
+    """
+    kind = type(node)
+    if kind is Number:
+        return T_INT if type(node.value) is int else T_REAL
+    if kind is Bool:
+        return T_BOOL
+    if kind is String:
+        return T_CHAR
+    if kind is Var or kind is ArrayRef:
+        return scalar_types.get(node.name) if node.slot is not None else None
+    if isinstance(node, (IntDivOp, ModOp)):
+        return T_INT
+    if isinstance(node, _INT_PRESERVING):
+        if static_type(node.left, scalar_types) == T_INT and static_type(node.right, scalar_types) == T_INT:
+            return T_INT
+        return None
+    if isinstance(node, UnOp) and node.op != "NOT":
+        return T_INT if static_type(node.expr, scalar_types) == T_INT else None
+    return None
+
+_LITERAL_VARIANTS = {
+    AddOp: AddLitOp, SubOp: SubLitOp, MulOp: MulLitOp,
+    IntDivIntOp: IntDivIntLitOp, ModIntOp: ModIntLitOp,
+    EqOp: EqLitOp, NeOp: NeLitOp, LtOp: LtLitOp, LeOp: LeLitOp, GtOp: GtLitOp, GeOp: GeLitOp,
+}
+
+def _specialize_body(stmts: List[ASTNode], scalar_types: Dict[str, int]):
+    """Swap operator nodes for the variants their operands allow.
+
+    DIV/MOD of two ΑΚΕΡΑΙΑ operands get the int-only variants, and operators
+    whose right operand is a numeric literal get the *LitOp variants. Scalar
+    assignments whose value already has the variable's type are marked
+    ``exact`` so that they store without coercion.
+    """
+    special = {IntDivOp: IntDivIntOp, ModOp: ModIntOp}
+    def retype(child):
+        cls = special.get(type(child))
+        if (cls is not None and static_type(child.left, scalar_types) == T_INT
+                and static_type(child.right, scalar_types) == T_INT):
+            child = cls(op=child.op, left=child.left, right=child.right, line=child.line)
+        right = child.right
+        if type(right) is Number:
+            cls = _LITERAL_VARIANTS.get(type(child))
+            # The int-only DIV/MOD variants skip the zero check
+            if cls is not None and (right.value != 0 or not issubclass(cls, (IntDivIntOp, ModIntOp))):
+                child = cls(op=child.op, left=child.left, right=right, line=child.line)
+        return child
+    def visit(value):
+        if isinstance(value, BinOp):
+            return retype(value)
+        if isinstance(value, list):
+            value[:] = [visit(v) for v in value]
+        elif isinstance(value, tuple):
+            for v in value:  # nested lists (ΠΕΡΙΠΤΩΣΗ values) are updated in place
+                visit(v)
+        return value
+    for node in iter_nodes(stmts):
+        for name in node_fields(type(node)):
+            child = getattr(node, name)
+            new = visit(child)
+            if new is not child:
+                setattr(node, name, new)
+        if type(node) is Assign and node.slot is not None and node.indices is None:
+            tp = scalar_types.get(node.name)
+            node.exact = tp is not None and static_type(node.expr, scalar_types) == tp
+
+def _propagate_constants(stmts: List[ASTNode], var_types: Dict[str, VarInfo],
+                         const_decls: Dict[str, Tuple[int, Any]]):
+    """Replace reads of this scope's ΣΤΑΘΕΡΕΣ by their values and refold.
+
+    Only references that resolved to a slot are replaced, so a subprogram
+    reading a caller's constant by name is untouched. ΔΙΑΒΑΣΕ targets are
+    left alone so that reading into a constant still fails at runtime.
+    """
+    values: Dict[str, Any] = {}
+    for name, (tp, value) in const_decls.items():
+        if name in var_types:
+            continue
+        try:
+            values[name] = COERCERS[tp](value)
+        except RuntimeErrorGlossa:
+            pass  # reported when the Env is built
+    def rewrite(value):
+        if isinstance(value, list):
+            value[:] = [rewrite(v) for v in value]
+            return value
+        if isinstance(value, tuple):
+            for v in value:  # ΠΕΡΙΠΤΩΣΗ (values, body) pairs hold lists
+                rewrite(v)
+            return value
+        if not isinstance(value, ASTNode) or type(value) is Read:
+            return value
+        kind = type(value)
+        if kind is Var:
+            if value.slot is not None and value.name in values:
+                return literal_node(values[value.name], value.line) or value
+            return value
+        for name in node_fields(kind):
+            child = getattr(value, name)
+            new = rewrite(child)
+            if new is not child:
+                setattr(value, name, new)
+        if isinstance(value, (BinOp, UnOp)):
+            return fold_constant(value)
+        if kind is Select and value.table is None:
+            value.table = case_table(value.cases)
+        return value
+    rewrite(stmts)
+
+def resolve_slots(prog: Program):
+    """Annotate name references with the slot they occupy in their scope's Env.
+
+    A reference gets a slot only when it names something of the right kind
+    declared in the scope that executes it: a scalar or constant for ``Var``,
+    a variable scalar for plain assignments and ΓΙΑ counters, an array for
+    indexed access. The interpreter may then read and write those slots
+    without further checks. Anything else (a subprogram reading a name from
+    its caller's frame, an undeclared name, or a kind mismatch that must
+    raise) keeps ``slot = None`` and goes through the by-name path.
+    """
+    scopes = [(prog.statements, prog.var_decls, prog.const_decls)]
+    for sub in list(prog.procedures.values()) + list(prog.functions.values()):
+        scopes.append((sub.statements, subprogram_types(sub), {}))
+    for stmts, var_types, const_decls in scopes:
+        _resolve_body(stmts, var_types, const_decls)
+        _resolve_calls(stmts, prog)
+        if const_decls:
+            _propagate_constants(stmts, var_types, const_decls)
+        # A name declared as both constant and variable has no reliable type
+        base_types = {name: base for name, (base, _) in var_types.items() if name not in const_decls}
+        base_types.update((name, tp) for name, (tp, _) in const_decls.items() if name not in var_types)
+        _specialize_body(stmts, base_types)
+    _mark_pure_functions(prog)
+
+# Node kinds that do I/O or can change a caller's variables
+_IMPURE_NODES = (Read, Write, ProcCall)
+
+def _mark_pure_functions(prog: Program):
+    """Give every function whose result depends only on its arguments a memo dict.
+
+    A function qualifies when its body does no I/O, calls no procedures,
+    touches only its own parameters and locals (every reference has a slot)
+    and calls only built-ins and other qualifying functions.
+    """
+    callees: Dict[str, set] = {}
+    for name, func in prog.functions.items():
+        called = set()
+        for node in iter_nodes(func.statements):
+            if isinstance(node, _IMPURE_NODES):
+                break
+            if isinstance(node, (Var, ArrayRef, Assign, For)) and node.slot is None:
+                break
+            if type(node) is FuncCall and node.name not in BUILTIN_FUNCTIONS:
+                if node.target is None:
+                    break
+                called.add(node.target.name)
+        else:
+            callees[name] = called
+    # Drop functions that call an impure one until nothing changes
+    changed = True
+    while changed:
+        changed = False
+        for name, called in list(callees.items()):
+            if not called <= callees.keys():
+                del callees[name]
+                changed = True
+    for name in callees:
+        prog.functions[name].memo = {}
+
+# -------------------- AST cache --------------------
+
+AST_CACHE_DIR = Path.home() / ".glossa_cache"
+AST_CACHE_MAX_AGE = 30 * 24 * 3600  # seconds
+
+def _compiler_fingerprint() -> Optional[str]:
+    """Hash of this module's source, so any change to the AST layout invalidates the cache."""
+    try:
+        data = Path(__file__).read_bytes()
+    except (NameError, OSError):
+        return None
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+# None when the module source cannot be read; the cache is then not used
+AST_CACHE_KEY = _compiler_fingerprint()
+
+def _cache_path(source: str) -> Path:
+    key = f"{AST_CACHE_KEY}:{sys.version_info[0]}.{sys.version_info[1]}:{source}"
+    h = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return AST_CACHE_DIR / f"{h}.pkl"
+
+def _prune_ast_cache(now: float):
+    """Delete cache entries and leftover temporary files older than AST_CACHE_MAX_AGE."""
+    for entry in AST_CACHE_DIR.iterdir():
+        try:
+            if entry.suffix in (".pkl", ".tmp") and now - entry.stat().st_mtime >= AST_CACHE_MAX_AGE:
+                entry.unlink()
+        except OSError:
+            pass
+
+def parse_cached(source: str) -> Program:
+    """Parse *source*, reusing a pickled AST from AST_CACHE_DIR when fresh.
+
+    Entries are keyed on the source, the Python version and a hash of this
+    module, and expire after AST_CACHE_MAX_AGE; expired ones are removed.
+    Lexer and parser errors are never cached. Any problem reading or writing
+    the cache falls back to a normal parse.
+    """
+    if AST_CACHE_KEY is None:
+        return Parser(lex(source)).parse()
+    path = _cache_path(source)
+    now = time.time()
+    try:
+        if now - path.stat().st_mtime < AST_CACHE_MAX_AGE:
+            prog = pickle.loads(path.read_bytes())
+            if isinstance(prog, Program):
+                return prog
+        path.unlink()
+    except Exception:
+        pass
+    prog = Parser(lex(source)).parse()
+    tmp = path.with_suffix(f".{id(prog)}.tmp")
+    try:
+        AST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _prune_ast_cache(now)
+        # Deeply nested ASTs can exceed the recursion limit while pickling;
+        # like any other failure here that only means the AST is not cached
+        tmp.write_bytes(pickle.dumps(prog, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp.replace(path)
+    except Exception:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+    return prog
+
 # -------------------- Interpreter --------------------
 
+def _coerce_int(value: Any) -> int:
+    if type(value) is int:
+        return value
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, float):
+        value = int(value)
+    if not isinstance(value, int):
+        raise RuntimeErrorGlossa("Αναμενόταν ακέραιος")
+    return value
+
+def _coerce_real(value: Any) -> float:
+    if type(value) is float:
+        return value
+    if isinstance(value, bool):
+        value = float(value)
+    if isinstance(value, int):
+        value = float(value)
+    if not isinstance(value, float):
+        raise RuntimeErrorGlossa("Αναμενόταν πραγματικός")
+    return value
+
+def _coerce_char(value: Any) -> str:
+    if not isinstance(value, str):
+        raise RuntimeErrorGlossa("Αναμενόταν αλφαριθμητικό")
+    return value
+
+def _coerce_bool(value: Any) -> bool:
+    if not isinstance(value, bool):
+        raise RuntimeErrorGlossa("Αναμενόταν λογική τιμή")
+    return value
+
+# Indexed by base type code (T_INT, T_REAL, T_CHAR, T_BOOL)
+COERCERS = (_coerce_int, _coerce_real, _coerce_char, _coerce_bool)
+DEFAULT_VALUES = (0, 0.0, "", False)
+
+# ``array.array`` type codes for element types that can be stored unboxed
+ARRAY_TYPECODES = {T_INT: "q", T_REAL: "d"}
+
 class RuntimeErrorGlossa(Exception):
     """Raised while executing a program when runtime semantics are violated."""
     pass
@@ -784,84 +1466,90 @@ class FunctionReturn(Exception):
 class Env:
     """Hold variable metadata and values during interpretation."""
 
+    # A fixed attribute layout keeps the per-call frames made by new_frame() small
+    __slots__ = ("parent", "types", "constants", "procedures", "functions",
+                 "slots", "names", "nconsts", "values", "infos", "coercers")
+
     def __init__(self, var_types: Dict[str, VarInfo], parent: Optional["Env"] = None,
                  procedures: Optional[Dict[str, ProcedureDef]] = None,
                  functions: Optional[Dict[str, FunctionDef]] = None,
-                 const_decls: Optional[Dict[str, Tuple[str, Any]]] = None):
+                 const_decls: Optional[Dict[str, Tuple[int, Any]]] = None):
         """Initialise storage with default values for declared variables."""
         self.parent = parent
         self.types = dict(var_types)
-        self.values: Dict[str, Any] = {}
-        self.constants: Dict[str, Tuple[str, Any]] = const_decls if const_decls is not None else {}
+        self.constants: Dict[str, Tuple[int, Any]] = const_decls if const_decls is not None else {}
         self.procedures = procedures if procedures is not None else (parent.procedures if parent else {})
         self.functions = functions if functions is not None else (parent.functions if parent else {})
+        # Values live in a list indexed by slot; constants occupy the first slots
+        self.slots = scope_layout(self.types, self.constants)
+        self.names = list(self.slots)
+        self.nconsts = len(self.constants)
+        self.values: List[Any] = [None] * len(self.slots)
+        self.infos: List[VarInfo] = [None] * len(self.slots)
+        # The coercer for each slot is picked once from its declared type
+        self.coercers: List[Callable[[Any], Any]] = [None] * len(self.slots)
         # Initialize constants with their values
         for name, (const_type, const_value) in self.constants.items():
-            self.values[name] = self._coerce(const_type, const_value)
+            slot = self.slots[name]
+            self.values[slot] = self._coerce(const_type, const_value)
+            self.infos[slot] = (const_type, None)
+            self.coercers[slot] = COERCERS[const_type]
         # Initialize variables with default values
         for name, (base, dims) in self.types.items():
+            slot = self.slots[name]
             if dims is None:
-                self.values[name] = self._default_value(base)
+                self.values[slot] = self._default_value(base)
             else:
-                self.values[name] = self._make_array(dims, base)
-
-    def _default_value(self, tp: str):
-        if tp == "TYPE_INT":
-            return 0
-        if tp == "TYPE_REAL":
-            return 0.0
-        if tp == "TYPE_CHAR":
-            return ""
-        if tp == "TYPE_BOOL":
-            return False
-        raise RuntimeErrorGlossa(f"Άγνωστος τύπος {tp}")
-
-    def _make_array(self, dims: List[int], tp: str):
+                self.values[slot] = self._make_array(dims, base)
+            if slot >= self.nconsts:
+                self.infos[slot] = (base, dims)
+                self.coercers[slot] = COERCERS[base]
+
+    @classmethod
+    def for_program(cls, prog: Program) -> "Env":
+        """Create the global scope for running *prog*.
+
+        The procedure and function tables are wrapped once in read-only views;
+        every call frame then shares these same objects (see ``new_frame``).
+        """
+        return cls(prog.var_decls, procedures=MappingProxyType(prog.procedures),
+                   functions=MappingProxyType(prog.functions), const_decls=prog.const_decls)
+
+    def _default_value(self, tp: int):
+        return DEFAULT_VALUES[tp]
+
+    def _make_array(self, dims: List[int], tp: int):
+        """Allocate flat, row-major storage for an array of shape *dims*.
+
+        Numeric arrays are unboxed ``array.array`` buffers; the rest are lists.
+        An ΑΚΕΡΑΙΑ array switches to a list once it must hold a value beyond
+        64 bits (see ``set_slot``), so integers stay exact as in scalars.
+        Element ``[i, j]`` of a 2D array lives at offset ``i * cols + j``.
+        """
         if len(dims) == 1:
-            return [self._default_value(tp) for _ in range(dims[0])]
-        if len(dims) == 2:
-            rows, cols = dims
-            return [
-                [self._default_value(tp) for _ in range(cols)]
-                for _ in range(rows)
-            ]
-        raise RuntimeErrorGlossa("Υποστηρίζονται μόνο 1D ή 2D πίνακες")
-
-    def _coerce(self, tp: str, value: Any):
-        if tp == "TYPE_INT":
-            if isinstance(value, bool):
-                value = int(value)
-            if isinstance(value, float):
-                value = int(value)
-            if not isinstance(value, int):
-                raise RuntimeErrorGlossa("Αναμενόταν ακέραιος")
-            return value
-        if tp == "TYPE_REAL":
-            if isinstance(value, bool):
-                value = float(value)
-            if isinstance(value, int):
-                value = float(value)
-            if not isinstance(value, float):
-                raise RuntimeErrorGlossa("Αναμενόταν πραγματικός")
-            return value
-        if tp == "TYPE_CHAR":
-            if not isinstance(value, str):
-                raise RuntimeErrorGlossa("Αναμενόταν αλφαριθμητικό")
-            return value
-        if tp == "TYPE_BOOL":
-            if not isinstance(value, bool):
-                raise RuntimeErrorGlossa("Αναμενόταν λογική τιμή")
-            return value
-        raise RuntimeErrorGlossa(f"Άγνωστος τύπος {tp}")
+            size = dims[0]
+        elif len(dims) == 2:
+            size = dims[0] * dims[1]
+        else:
+            raise RuntimeErrorGlossa("Υποστηρίζονται μόνο 1D ή 2D πίνακες")
+        default = self._default_value(tp)
+        typecode = ARRAY_TYPECODES.get(tp)
+        if typecode is not None:
+            return array(typecode, [default]) * size
+        return [default] * size
+
+    def _coerce(self, tp: int, value: Any):
+        return COERCERS[tp](value)
 
     def _find_owner(self, name: str) -> Optional["Env"]:
-        if name in self.types or name in self.constants:
-            return self
-        if self.parent:
-            return self.parent._find_owner(name)
+        env = self
+        while env is not None:
+            if name in env.types or name in env.constants:
+                return env
+            env = env.parent
         return None
 
-    def get_type(self, name: str) -> Tuple[str, Optional[List[int]]]:
+    def get_type(self, name: str) -> VarInfo:
         owner = self._find_owner(name)
         if owner is None:
             raise RuntimeErrorGlossa(f"Άγνωστη μεταβλητή '{name}'")
@@ -871,67 +1559,77 @@ class Env:
             return (const_type, None)
         return owner.types[name]
 
-    def _resolve_indices(self, name: str, indices: List[int]) -> Tuple["Env", Any, List[int], str]:
-        owner = self._find_owner(name)
-        if owner is None:
-            raise RuntimeErrorGlossa(f"Άγνωστη μεταβλητή '{name}'")
-        base_type, dims = owner.types[name]
+    def _resolve_indices(self, slot: int, indices: List[int]) -> Tuple[Any, int, int]:
+        name = self.names[slot]
+        base_type, dims = self.infos[slot]
         if dims is None:
             raise RuntimeErrorGlossa(f"Η '{name}' δεν είναι πίνακας")
         if len(indices) != len(dims):
             raise RuntimeErrorGlossa(f"Ο πίνακας '{name}' αναμένει {len(dims)} δείκτες")
-        zero_based: List[int] = []
-        for idx_val, size in zip(indices, dims):
-            if not isinstance(idx_val, int):
-                raise RuntimeErrorGlossa("Οι δείκτες πίνακα πρέπει να είναι ακέραιοι")
-            if idx_val < 1 or idx_val > size:
-                raise RuntimeErrorGlossa(f"Η πρόσβαση στον πίνακα '{name}' είναι εκτός ορίων")
-            zero_based.append(idx_val - 1)
-        array_obj = owner.values[name]
-        return owner, array_obj, zero_based, base_type
+        # Arrays have one or two dimensions; a row of a 2D array is dims[1] long
+        i = indices[0]
+        if not isinstance(i, int):
+            raise RuntimeErrorGlossa("Οι δείκτες πίνακα πρέπει να είναι ακέραιοι")
+        if i < 1 or i > dims[0]:
+            raise RuntimeErrorGlossa(f"Η πρόσβαση στον πίνακα '{name}' είναι εκτός ορίων")
+        if len(dims) == 1:
+            return self.values[slot], i - 1, base_type
+        j = indices[1]
+        if not isinstance(j, int):
+            raise RuntimeErrorGlossa("Οι δείκτες πίνακα πρέπει να είναι ακέραιοι")
+        cols = dims[1]
+        if j < 1 or j > cols:
+            raise RuntimeErrorGlossa(f"Η πρόσβαση στον πίνακα '{name}' είναι εκτός ορίων")
+        return self.values[slot], (i - 1) * cols + j - 1, base_type
 
     def set(self, name: str, val: Any, indices: Optional[List[int]] = None):
         """Assign *val* to *name*, supporting optional array indices."""
         owner = self._find_owner(name)
         if owner is None:
             raise RuntimeErrorGlossa(f"Άγνωστη μεταβλητή '{name}'")
-        # Check if trying to modify a constant
-        if name in owner.constants:
-            raise RuntimeErrorGlossa(f"Δεν μπορείς να τροποποιήσεις τη σταθερά '{name}'")
-        base_type, dims = owner.types[name]
-        if indices is None:
-            if dims is not None:
-                raise RuntimeErrorGlossa(f"Η '{name}' είναι πίνακας - απαιτούνται δείκτες")
-            coerced = owner._coerce(base_type, val)
-            owner.values[name] = coerced
-            return
-        owner_env, array_obj, zero_indices, base = self._resolve_indices(name, indices)
-        coerced = owner_env._coerce(base, val)
-        if len(zero_indices) == 1:
-            array_obj[zero_indices[0]] = coerced
-        else:
-            array_obj[zero_indices[0]][zero_indices[1]] = coerced
+        owner.set_slot(owner.slots[name], val, indices)
 
     def get(self, name: str, indices: Optional[List[int]] = None):
         """Return the current value for *name* or a specific array element."""
         owner = self._find_owner(name)
         if owner is None:
             raise RuntimeErrorGlossa(f"Άγνωστη μεταβλητή '{name}'")
+        return owner.get_slot(owner.slots[name], indices)
+
+    def set_slot(self, slot: int, val: Any, indices: Optional[List[int]] = None):
+        """Assign *val* to the variable stored in *slot* of this scope."""
+        # Check if trying to modify a constant
+        if slot < self.nconsts:
+            raise RuntimeErrorGlossa(f"Δεν μπορείς να τροποποιήσεις τη σταθερά '{self.names[slot]}'")
+        base_type, dims = self.infos[slot]
+        if indices is None:
+            if dims is not None:
+                raise RuntimeErrorGlossa(f"Η '{self.names[slot]}' είναι πίνακας - απαιτούνται δείκτες")
+            self.values[slot] = self.coercers[slot](val)
+            return
+        array_obj, offset, _ = self._resolve_indices(slot, indices)
+        coerced = self.coercers[slot](val)
+        try:
+            array_obj[offset] = coerced
+        except OverflowError:
+            # An ΑΚΕΡΑΙΑ beyond 64 bits: keep it exact by moving the array to a list
+            array_obj = self.values[slot] = array_obj.tolist()
+            array_obj[offset] = coerced
+
+    def get_slot(self, slot: int, indices: Optional[List[int]] = None):
+        """Return the value stored in *slot* of this scope, or one of its elements."""
         # Check if it's a constant
-        if name in owner.constants:
+        if slot < self.nconsts:
             if indices is not None:
-                raise RuntimeErrorGlossa(f"Η σταθερά '{name}' δεν είναι πίνακας")
-            return owner.values[name]
+                raise RuntimeErrorGlossa(f"Η σταθερά '{self.names[slot]}' δεν είναι πίνακας")
+            return self.values[slot]
         # It's a variable
-        base_type, dims = owner.types[name]
         if indices is None:
-            if dims is not None:
-                raise RuntimeErrorGlossa(f"Η '{name}' είναι πίνακας - δώσε δείκτες")
-            return owner.values[name]
-        _, array_obj, zero_indices, _ = self._resolve_indices(name, indices)
-        if len(zero_indices) == 1:
-            return array_obj[zero_indices[0]]
-        return array_obj[zero_indices[0]][zero_indices[1]]
+            if self.infos[slot][1] is not None:
+                raise RuntimeErrorGlossa(f"Η '{self.names[slot]}' είναι πίνακας - δώσε δείκτες")
+            return self.values[slot]
+        array_obj, offset, _ = self._resolve_indices(slot, indices)
+        return array_obj[offset]
 
 class IOHandler:
     """Abstract I/O surface used by the interpreter."""
@@ -940,116 +1638,337 @@ class IOHandler:
         """Initialise a handler with optional scripted input."""
         self.outputs: List[str] = []
         self.input_queue = input_queue or []
+        # Position of the next unread input; popping the list head would be O(n)
+        self._input_idx = 0
 
     def write(self, text: str):
         """Record text output."""
         self.outputs.append(text)
 
     def read(self) -> str:
-        """Pop the next scripted input or fail if none is available."""
-        if not self.input_queue:
+        """Return the next scripted input or fail if none is available."""
+        idx = self._input_idx
+        if idx >= len(self.input_queue):
             raise RuntimeErrorGlossa("Απαιτείται είσοδος (ΔΙΑΒΑΣΕ) αλλά δεν δόθηκε input_queue")
-        return self.input_queue.pop(0)
-
-def eval_expr(node: ASTNode, env: Env, io: IOHandler, debugger=None) -> Any:
-    """Evaluate an expression node within *env* and return the value."""
-    if isinstance(node, Number):
-        return node.value
-    if isinstance(node, String):
-        return node.value
-    if isinstance(node, Bool):
-        return node.value
-    if isinstance(node, Var):
+        self._input_idx = idx + 1
+        return self.input_queue[idx]
+
+# Handlers evaluate their operands by indexing _EXPR_DISPATCH themselves
+# rather than through eval_expr: that saves one Python call per node, and
+# calls per node are most of the cost of walking an expression tree.
+def _eval_literal(node: ASTNode, env: Env, io: IOHandler, debugger=None) -> Any:
+    return node.value
+
+def _eval_var(node: Var, env: Env, io: IOHandler, debugger=None) -> Any:
+    slot = node.slot
+    if slot is None:
         return env.get(node.name)
-    if isinstance(node, ArrayRef):
-        indices = [_coerce_index(eval_expr(idx, env, io, debugger), node.line) for idx in node.indices]
+    # resolve_slots only gives a Var the slot of a scalar or constant
+    return env.values[slot]
+
+def _eval_array_ref(node: ArrayRef, env: Env, io: IOHandler, debugger=None) -> Any:
+    indices = []
+    for idx in node.indices:
+        value = _EXPR_DISPATCH[idx.OP](idx, env, io, debugger)
+        # Integer indices, by far the most common, skip the call
+        indices.append(value if type(value) is int else _coerce_index(value, node.line))
+    if node.slot is None:
         return env.get(node.name, indices)
-    if isinstance(node, FuncCall):
-        return call_function(node.name, node.args, env, io, debugger)
-    if isinstance(node, UnOp):
-        v = eval_expr(node.expr, env, io, debugger)
-        if node.op == "MINUS":
-            return -v
-        if node.op == "PLUS":
-            return +v
-        if node.op == "NOT":
-            return (not bool(v))
+    # The resolver gives an ArrayRef a slot only when it names a local array
+    array_obj, offset, _ = env._resolve_indices(node.slot, indices)
+    return array_obj[offset]
+
+def _eval_func_call(node: FuncCall, env: Env, io: IOHandler, debugger=None) -> Any:
+    target = node.target
+    if target is not None:
+        return invoke_function(target, node.args, env, io, debugger)
+    return call_function(node.name, node.args, env, io, debugger)
+
+def _eval_neg(node: UnOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    return -_EXPR_DISPATCH[node.expr.OP](node.expr, env, io, debugger)
+
+def _eval_pos(node: UnOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    return +_EXPR_DISPATCH[node.expr.OP](node.expr, env, io, debugger)
+
+def _eval_not(node: UnOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    return False if _EXPR_DISPATCH[node.expr.OP](node.expr, env, io, debugger) else True
+
+# Generic fallbacks for operator nodes built directly rather than by the
+# parser: look up the handler of the matching subclass by ``op``.
+def _eval_unop(node: UnOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    cls = UNOP_CLASSES.get(node.op)
+    if cls is None:
         raise RuntimeErrorGlossa("Άγνωστος μονοσήμαντος τελεστής")
-    if isinstance(node, BinOp):
-        l = eval_expr(node.left, env, io, debugger)
-        r = eval_expr(node.right, env, io, debugger)
-        op = node.op
-        if op == "PLUS": return l + r
-        if op == "MINUS": return l - r
-        if op == "MUL": return l * r
-        if op == "DIVIDE":
-            if r == 0:
-                raise RuntimeErrorGlossa("Διαίρεση με το μηδέν")
-            return l / r
-        if op == "DIV":
-            if r == 0:
-                raise RuntimeErrorGlossa("Διαίρεση με το μηδέν")
-            return int(l) // int(r)
-        if op in ("MOD","MOD_SYM"):
-            if r == 0:
-                raise RuntimeErrorGlossa("Υπόλοιπο με το μηδέν")
-            return int(l) % int(r)
-        if op == "EQ": return l == r
-        if op == "NE": return l != r
-        if op == "LT": return l < r
-        if op == "LE": return l <= r
-        if op == "GT": return l > r
-        if op == "GE": return l >= r
-        if op == "AND": return bool(l) and bool(r)
-        if op == "OR": return bool(l) or bool(r)
+    return _EXPR_DISPATCH[cls.OP](node, env, io, debugger)
+
+def _eval_binop(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    cls = BINOP_CLASSES.get(node.op)
+    if cls is None:
         raise RuntimeErrorGlossa("Άγνωστος τελεστής")
+    return _EXPR_DISPATCH[cls.OP](node, env, io, debugger)
+
+def _eval_add(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    return l + r
+
+def _eval_sub(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    return l - r
+
+def _eval_mul(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    return l * r
+
+def _eval_div(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    if r == 0:
+        raise RuntimeErrorGlossa("Διαίρεση με το μηδέν")
+    return l / r
+
+def _eval_intdiv(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    if r == 0:
+        raise RuntimeErrorGlossa("Διαίρεση με το μηδέν")
+    return int(l) // int(r)
+
+def _eval_mod(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    if r == 0:
+        raise RuntimeErrorGlossa("Υπόλοιπο με το μηδέν")
+    return int(l) % int(r)
+
+def _eval_intdiv_int(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    if r == 0:
+        raise RuntimeErrorGlossa("Διαίρεση με το μηδέν")
+    return l // r
+
+def _eval_mod_int(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    if r == 0:
+        raise RuntimeErrorGlossa("Υπόλοιπο με το μηδέν")
+    return l % r
+
+def _eval_eq(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    return l == r
+
+def _eval_ne(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    return l != r
+
+def _eval_lt(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    return l < r
+
+def _eval_le(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    return l <= r
+
+def _eval_gt(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    return l > r
+
+def _eval_ge(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    r = _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger)
+    return l >= r
+
+# Right operand is a Number (see the *LitOp classes)
+def _eval_add_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l + node.right.value
+
+def _eval_sub_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l - node.right.value
+
+def _eval_mul_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l * node.right.value
+
+def _eval_intdiv_int_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l // node.right.value
+
+def _eval_mod_int_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l % node.right.value
+
+def _eval_eq_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l == node.right.value
+
+def _eval_ne_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l != node.right.value
+
+def _eval_lt_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l < node.right.value
+
+def _eval_le_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l <= node.right.value
+
+def _eval_gt_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l > node.right.value
+
+def _eval_ge_lit(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    l = _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger)
+    return l >= node.right.value
+
+# ΚΑΙ / Η evaluate the right operand only when the left one does not decide
+def _eval_and(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    if not _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger):
+        return False
+    return True if _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger) else False
+
+def _eval_or(node: BinOp, env: Env, io: IOHandler, debugger=None) -> Any:
+    if _EXPR_DISPATCH[node.left.OP](node.left, env, io, debugger):
+        return True
+    return True if _EXPR_DISPATCH[node.right.OP](node.right, env, io, debugger) else False
+
+def _eval_unsupported(node: ASTNode, env: Env, io: IOHandler, debugger=None) -> Any:
     raise RuntimeErrorGlossa("Μη υποστηριζόμενη έκφραση")
 
+# Expression handlers per node class, laid out by OP in _EXPR_DISPATCH
+_EXPR_HANDLERS = {
+    Number: _eval_literal,
+    String: _eval_literal,
+    Bool: _eval_literal,
+    Var: _eval_var,
+    ArrayRef: _eval_array_ref,
+    FuncCall: _eval_func_call,
+    UnOp: _eval_unop,
+    NegOp: _eval_neg,
+    PosOp: _eval_pos,
+    NotOp: _eval_not,
+    BinOp: _eval_binop,
+    AddOp: _eval_add,
+    SubOp: _eval_sub,
+    MulOp: _eval_mul,
+    DivOp: _eval_div,
+    IntDivOp: _eval_intdiv,
+    ModOp: _eval_mod,
+    EqOp: _eval_eq,
+    NeOp: _eval_ne,
+    LtOp: _eval_lt,
+    LeOp: _eval_le,
+    GtOp: _eval_gt,
+    GeOp: _eval_ge,
+    AndOp: _eval_and,
+    OrOp: _eval_or,
+    IntDivIntOp: _eval_intdiv_int,
+    ModIntOp: _eval_mod_int,
+    AddLitOp: _eval_add_lit,
+    SubLitOp: _eval_sub_lit,
+    MulLitOp: _eval_mul_lit,
+    IntDivIntLitOp: _eval_intdiv_int_lit,
+    ModIntLitOp: _eval_mod_int_lit,
+    EqLitOp: _eval_eq_lit,
+    NeLitOp: _eval_ne_lit,
+    LtLitOp: _eval_lt_lit,
+    LeLitOp: _eval_le_lit,
+    GtLitOp: _eval_gt_lit,
+    GeLitOp: _eval_ge_lit,
+}
+_EXPR_DISPATCH = dispatch_table(_EXPR_HANDLERS, _eval_unsupported)
+
+def eval_expr(node: ASTNode, env: Env, io: IOHandler, debugger=None) -> Any:
+    """Evaluate an expression node within *env* and return the value."""
+    return _EXPR_DISPATCH[node.OP](node, env, io, debugger)
+
 def _coerce_index(value: Any, line: int) -> int:
     """Convert an index expression result to an integer with validation."""
-    if isinstance(value, bool):
-        value = int(value)
-    if isinstance(value, float):
-        if value.is_integer():
-            value = int(value)
-        else:
-            raise RuntimeErrorGlossa(f"Ο δείκτης πίνακα πρέπει να είναι ακέραιος (γραμμή {line})")
-    if not isinstance(value, int):
-        raise RuntimeErrorGlossa(f"Ο δείκτης πίνακα πρέπει να είναι ακέραιος (γραμμή {line})")
-    return value
+    kind = type(value)
+    if kind is int:
+        return value
+    if kind is bool or (kind is float and value.is_integer()):
+        return int(value)
+    raise RuntimeErrorGlossa(f"Ο δείκτης πίνακα πρέπει να είναι ακέραιος (γραμμή {line})")
+
+TRUE_INPUTS = frozenset(("ΑΛΗΘΗΣ", "TRUE", "1"))
+
+def _input_bool(raw: str) -> bool:
+    return raw.strip().upper() in TRUE_INPUTS
+
+# Indexed by base type code, like COERCERS
+INPUT_CONVERTERS = (int, float, str, _input_bool)
 
-def _convert_input(raw: str, base_type: str):
-    """Convert text input to the requested base type."""
-    if base_type == "TYPE_INT":
-        return int(raw)
-    if base_type == "TYPE_REAL":
-        return float(raw)
-    if base_type == "TYPE_CHAR":
-        return str(raw)
-    if base_type == "TYPE_BOOL":
-        return True if raw.strip().upper() in ("ΑΛΗΘΗΣ","TRUE","1") else False
-    return raw
 
+# Upper bound on the results remembered per pure function
+MEMO_LIMIT = 100_000
+
+def frame_prototype(sub: Union[ProcedureDef, FunctionDef]) -> Tuple[Env, List[int], List[Tuple[int, Any]]]:
+    """Return (prototype Env, array slots, [(parameter slot, coercer)]) for *sub*, built once."""
+    frame = sub.frame
+    if frame is None:
+        proto = Env(subprogram_types(sub))
+        arrays = [slot for slot, info in enumerate(proto.infos) if info[1] is not None]
+        params = [(proto.slots[p.name], COERCERS[p.type]) for p in sub.params]
+        frame = sub.frame = (proto, arrays, params)
+    return frame
+
+def new_frame(sub: Union[ProcedureDef, FunctionDef], args: List[Any], parent: Env) -> Env:
+    """Return a fresh Env for a call to *sub* with its parameters bound to *args*.
+
+    The frame layout of a subprogram never changes, so the first call builds
+    a prototype Env and later calls clone it: the type tables are shared and
+    only the value list (plus any array buffers) is copied.
+    """
+    proto, arrays, params = frame_prototype(sub)
+    # Fill every Env slot, sharing the read-only tables with the prototype
+    env = Env.__new__(Env)
+    env.parent = parent
+    env.types = proto.types
+    env.constants = proto.constants
+    env.procedures = parent.procedures
+    env.functions = parent.functions
+    env.slots = proto.slots
+    env.names = proto.names
+    env.nconsts = 0
+    values = env.values = proto.values[:]
+    env.infos = proto.infos
+    env.coercers = proto.coercers
+    for slot in arrays:
+        values[slot] = values[slot][:]
+    for (slot, coerce), value in zip(params, args):
+        values[slot] = coerce(value)
+    return env
 
 def call_procedure(name: str, args: List[ASTNode], env: Env, io: IOHandler, debugger=None):
     proc = env.procedures.get(name)
     if proc is None:
         raise RuntimeErrorGlossa(f"Άγνωστη διαδικασία '{name}'")
+    invoke_procedure(proc, args, env, io, debugger)
+
+def invoke_procedure(proc: ProcedureDef, args: List[ASTNode], env: Env, io: IOHandler, debugger=None):
+    """Run an already resolved procedure with the argument expressions *args*."""
+    name = proc.name
     if len(args) != len(proc.params):
         raise RuntimeErrorGlossa(f"Η διαδικασία '{name}' αναμένει {len(proc.params)} ορίσματα")
     evaluated_args = [eval_expr(arg, env, io, debugger) for arg in args]
-    local_types: Dict[str, VarInfo] = dict(proc.locals)
-    for param in proc.params:
-        local_types[param.name] = (param.type, None)
-    child_env = Env(local_types, parent=env)
-    for param, value in zip(proc.params, evaluated_args):
-        child_env.set(param.name, value)
+    child_env = new_frame(proc, evaluated_args, env)
     try:
         exec_statements(proc.statements, child_env, io, debugger=debugger)
     except FunctionReturn:
         raise RuntimeErrorGlossa(f"Η διαδικασία '{name}' δεν μπορεί να επιστρέψει τιμή")
 
-
 def call_function(name: str, args: List[ASTNode], env: Env, io: IOHandler, debugger=None):
     # Check for built-in functions first
     builtin_result = call_builtin_function(name, args, env, io, debugger)
@@ -1059,20 +1978,80 @@ def call_function(name: str, args: List[ASTNode], env: Env, io: IOHandler, debug
     func = env.functions.get(name)
     if func is None:
         raise RuntimeErrorGlossa(f"Άγνωστη συνάρτηση '{name}'")
+    return invoke_function(func, args, env, io, debugger)
+
+def invoke_function(func: FunctionDef, args: List[ASTNode], env: Env, io: IOHandler, debugger=None):
+    """Run an already resolved user function and return its coerced result."""
+    name = func.name
     if len(args) != len(func.params):
         raise RuntimeErrorGlossa(f"Η συνάρτηση '{name}' αναμένει {len(func.params)} ορίσματα")
     evaluated_args = [eval_expr(arg, env, io, debugger) for arg in args]
-    local_types: Dict[str, VarInfo] = dict(func.locals)
-    for param in func.params:
-        local_types[param.name] = (param.type, None)
-    child_env = Env(local_types, parent=env)
-    for param, value in zip(func.params, evaluated_args):
-        child_env.set(param.name, value)
+    memo = func.memo
+    if memo is None or debugger:
+        return _run_function(func, evaluated_args, env, io, debugger)
+    # A pure function: reuse the result of an earlier call with equal arguments
+    key = tuple(coerce(value) for (_, coerce), value in zip(frame_prototype(func)[2], evaluated_args))
+    result = memo.get(key, memo)
+    if result is memo:
+        result = _run_function(func, evaluated_args, env, io, debugger)
+        if len(memo) < MEMO_LIMIT:
+            memo[key] = result
+    return result
+
+def _run_function(func: FunctionDef, evaluated_args: List[Any], env: Env, io: IOHandler, debugger=None):
+    child_env = new_frame(func, evaluated_args, env)
     try:
         exec_statements(func.statements, child_env, io, debugger=debugger)
     except FunctionReturn as ret:
         return child_env._coerce(func.return_type, ret.value)
-    raise RuntimeErrorGlossa(f"Η συνάρτηση '{name}' δεν επέστρεψε τιμή")
+    raise RuntimeErrorGlossa(f"Η συνάρτηση '{func.name}' δεν επέστρεψε τιμή")
+
+def _builtin_int_part(x):
+    # Integer part - truncates towards zero (like int() in Python)
+    return int(x)
+
+def _builtin_abs(x):
+    # Absolute value - preserves type (int->int, float->float)
+    result = abs(x)
+    return int(result) if isinstance(x, int) else result
+
+def _builtin_exp(x):
+    return math.exp(float(x))
+
+def _builtin_tan(x):
+    # Input in degrees
+    return math.tan(math.radians(float(x)))
+
+def _builtin_sin(x):
+    return math.sin(math.radians(float(x)))
+
+def _builtin_cos(x):
+    return math.cos(math.radians(float(x)))
+
+def _builtin_log(x):
+    float_val = float(x)
+    if float_val <= 0:
+        raise RuntimeErrorGlossa(f"Η συνάρτηση ΛΟΓ δεν δέχεται μη θετικούς αριθμούς")
+    return math.log(float_val)
+
+def _builtin_sqrt(x):
+    float_val = float(x)
+    if float_val < 0:
+        raise RuntimeErrorGlossa(f"Η συνάρτηση Τ_Ρ δεν δέχεται αρνητικούς αριθμούς")
+    return math.sqrt(float_val)
+
+# Built-in function name -> implementation taking the evaluated argument
+BUILTIN_IMPLS = {
+    "Α_Μ": _builtin_int_part,
+    "Α_Τ": _builtin_abs,
+    "Ε": _builtin_exp,
+    "ΕΦ": _builtin_tan,
+    "ΗΜ": _builtin_sin,
+    "ΛΟΓ": _builtin_log,
+    "ΣΥΝ": _builtin_cos,
+    "Τ_Ρ": _builtin_sqrt,
+}
+BUILTIN_FUNCTIONS = frozenset(BUILTIN_IMPLS)
 
 def call_builtin_function(name: str, args: List[ASTNode], env: Env, io: IOHandler, debugger=None):
     """Handle built-in functions (ενσωματωμένες συναρτήσεις).
@@ -1088,9 +2067,8 @@ def call_builtin_function(name: str, args: List[ASTNode], env: Env, io: IOHandle
     - ΣΥΝ(x): Cosine (input in degrees)
     - Τ_Ρ(x): Square root
     """
-    builtin_funcs = ["Α_Μ", "Α_Τ", "Ε", "ΕΦ", "ΗΜ", "ΛΟΓ", "ΣΥΝ", "Τ_Ρ"]
-    
-    if name not in builtin_funcs:
+    impl = BUILTIN_IMPLS.get(name)
+    if impl is None:
         return None
     
     # All built-in functions take exactly one argument
@@ -1102,54 +2080,10 @@ def call_builtin_function(name: str, args: List[ASTNode], env: Env, io: IOHandle
     
     # Ensure numeric input
     if not isinstance(arg_value, (int, float)):
-        if isinstance(arg_value, bool):
-            arg_value = float(arg_value)
-        else:
-            raise RuntimeErrorGlossa(f"Η συνάρτηση '{name}' απαιτεί αριθμητικό όρισμα")
+        raise RuntimeErrorGlossa(f"Η συνάρτηση '{name}' απαιτεί αριθμητικό όρισμα")
     
     try:
-        if name == "Α_Μ":
-            # Integer part - truncates towards zero (like int() in Python)
-            return int(arg_value)
-        
-        elif name == "Α_Τ":
-            # Absolute value - preserves type (int->int, float->float)
-            result = abs(arg_value)
-            return int(result) if isinstance(arg_value, int) else result
-        
-        elif name == "Ε":
-            # Exponential (e^x)
-            return math.exp(float(arg_value))
-        
-        elif name == "ΕΦ":
-            # Tangent (input in degrees)
-            radians = math.radians(float(arg_value))
-            return math.tan(radians)
-        
-        elif name == "ΗΜ":
-            # Sine (input in degrees)
-            radians = math.radians(float(arg_value))
-            return math.sin(radians)
-        
-        elif name == "ΛΟΓ":
-            # Natural logarithm
-            float_val = float(arg_value)
-            if float_val <= 0:
-                raise RuntimeErrorGlossa(f"Η συνάρτηση ΛΟΓ δεν δέχεται μη θετικούς αριθμούς")
-            return math.log(float_val)
-        
-        elif name == "ΣΥΝ":
-            # Cosine (input in degrees)
-            radians = math.radians(float(arg_value))
-            return math.cos(radians)
-        
-        elif name == "Τ_Ρ":
-            # Square root
-            float_val = float(arg_value)
-            if float_val < 0:
-                raise RuntimeErrorGlossa(f"Η συνάρτηση Τ_Ρ δεν δέχεται αρνητικούς αριθμούς")
-            return math.sqrt(float_val)
-    
+        return impl(arg_value)
     except ValueError as e:
         raise RuntimeErrorGlossa(f"Σφάλμα στην εκτέλεση της συνάρτησης '{name}': {str(e)}")
     except OverflowError:
@@ -1161,95 +2095,631 @@ def exec_statements(stmts: List[ASTNode], env: Env, io: IOHandler, debugger=None
     If *debugger* is supplied, its ``before_statement`` and ``after_statement``
     hooks (when available) wrap every statement execution.
     """
+    dispatch = _STMT_DISPATCH
+    if not debugger:
+        for st in stmts:
+            dispatch[st.OP](st, env, io, debugger)
+        return
+    before = getattr(debugger, "before_statement", None)
+    after = getattr(debugger, "after_statement", None)
     for st in stmts:
-        if debugger and hasattr(debugger, "before_statement"):
-            debugger.before_statement(st, env)
-        exec_statement(st, env, io, debugger=debugger)
-        if debugger and hasattr(debugger, "after_statement"):
-            debugger.after_statement(st, env)
+        if before is not None:
+            before(st, env)
+        dispatch[st.OP](st, env, io, debugger)
+        if after is not None:
+            after(st, env)
 
 def exec_statement(st: ASTNode, env: Env, io: IOHandler, debugger=None):
     """Execute a single statement node."""
-    if isinstance(st, Assign):
-        val = eval_expr(st.expr, env, io, debugger)
-        indices = None
-        if st.indices is not None:
-            indices = [_coerce_index(eval_expr(idx, env, io, debugger), idx.line) for idx in st.indices]
+    _STMT_DISPATCH[st.OP](st, env, io, debugger)
+
+def _exec_assign(st: Assign, env: Env, io: IOHandler, debugger=None):
+    val = _EXPR_DISPATCH[st.expr.OP](st.expr, env, io, debugger)
+    indices = None
+    if st.indices is not None:
+        indices = []
+        for idx in st.indices:
+            value = _EXPR_DISPATCH[idx.OP](idx, env, io, debugger)
+            indices.append(value if type(value) is int else _coerce_index(value, idx.line))
+    slot = st.slot
+    if slot is None:
         env.set(st.name, val, indices=indices)
-    elif isinstance(st, Write):
-        parts = [eval_expr(e, env, io, debugger) for e in st.exprs]
-        def to_text(v):
-            if isinstance(v, bool): return "ΑΛΗΘΗΣ" if v else "ΨΕΥΔΗΣ"
-            return str(v)
-        io.write(" ".join(to_text(p) for p in parts))
-    elif isinstance(st, Read):
-        for target in st.targets:
-            raw = io.read()
-            if isinstance(target, Var):
-                base_type, _ = env.get_type(target.name)
-                val = _convert_input(raw, base_type)
-                env.set(target.name, val)
-            elif isinstance(target, ArrayRef):
-                base_type, _ = env.get_type(target.name)
-                val = _convert_input(raw, base_type)
-                indices = [_coerce_index(eval_expr(idx, env, io, debugger), idx.line) for idx in target.indices]
-                env.set(target.name, val, indices=indices)
-            else:
-                raise RuntimeErrorGlossa("Μη υποστηριζόμενος στόχος ΔΙΑΒΑΣΕ")
-    elif isinstance(st, If):
-        cond = eval_expr(st.cond, env, io, debugger)
-        if cond:
-            exec_statements(st.then_body, env, io, debugger=debugger)
-        elif st.else_body is not None:
-            exec_statements(st.else_body, env, io, debugger=debugger)
-    elif isinstance(st, While):
-        while eval_expr(st.cond, env, io, debugger):
-            exec_statements(st.body, env, io, debugger=debugger)
-    elif isinstance(st, Repeat):
-        while True:
-            exec_statements(st.body, env, io, debugger=debugger)
-            if eval_expr(st.cond, env, io, debugger):
-                break
-    elif isinstance(st, Select):
-        target = eval_expr(st.expr, env, io, debugger)
-        matched = False
-        for values, body in st.cases:
-            for val_expr in values:
-                if eval_expr(val_expr, env, io, debugger) == target:
-                    exec_statements(body, env, io, debugger=debugger)
-                    matched = True
-                    break
-            if matched:
+    elif indices is None:
+        # A plain assignment only gets the slot of a variable scalar
+        env.values[slot] = val if st.exact else env.coercers[slot](val)
+    else:
+        env.set_slot(slot, val, indices)
+
+BOOL_TEXT = ("ΑΛΗΘΗΣ", "ΨΕΥΔΗΣ")
+
+def _to_text(value: Any) -> str:
+    """Format a value the way ΓΡΑΨΕ prints it."""
+    return BOOL_TEXT[not value] if type(value) is bool else str(value)
+
+def _exec_write(st: Write, env: Env, io: IOHandler, debugger=None):
+    exprs = st.exprs
+    if len(exprs) == 1:
+        io.write(_to_text(eval_expr(exprs[0], env, io, debugger)))
+        return
+    parts = [eval_expr(e, env, io, debugger) for e in exprs]
+    io.write(" ".join(map(_to_text, parts)))
+
+def _exec_read(st: Read, env: Env, io: IOHandler, debugger=None):
+    for target in st.targets:
+        raw = io.read()
+        kind = type(target)
+        if kind is not Var and kind is not ArrayRef:
+            raise RuntimeErrorGlossa("Μη υποστηριζόμενος στόχος ΔΙΑΒΑΣΕ")
+        # Find the scope holding the target once; its slot then gives both
+        # the declared type and the storage
+        owner, slot = env, target.slot
+        if slot is None:
+            owner = env._find_owner(target.name)
+            if owner is None:
+                raise RuntimeErrorGlossa(f"Άγνωστη μεταβλητή '{target.name}'")
+            slot = owner.slots[target.name]
+        val = INPUT_CONVERTERS[owner.infos[slot][0]](raw)
+        if kind is Var:
+            owner.set_slot(slot, val)
+        else:
+            indices = [_coerce_index(eval_expr(idx, env, io, debugger), idx.line) for idx in target.indices]
+            owner.set_slot(slot, val, indices)
+
+def _exec_if(st: If, env: Env, io: IOHandler, debugger=None):
+    cond = _EXPR_DISPATCH[st.cond.OP](st.cond, env, io, debugger)
+    if cond:
+        exec_statements(st.then_body, env, io, debugger=debugger)
+    elif st.else_body is not None:
+        exec_statements(st.else_body, env, io, debugger=debugger)
+
+def _run_kernel(st: Union[For, While, Repeat], env: Env) -> bool:
+    """Run *st* as a compiled Python function if it can be; report whether it ran."""
+    kernel = st.kernel
+    if kernel is None:
+        kernel = st.kernel = compile_loop(st, env) or False
+    if kernel:
+        kernel(env.values)
+        return True
+    return False
+
+def _exec_while(st: While, env: Env, io: IOHandler, debugger=None):
+    if not debugger and _run_kernel(st, env):
+        return
+    while _EXPR_DISPATCH[st.cond.OP](st.cond, env, io, debugger):
+        exec_statements(st.body, env, io, debugger=debugger)
+
+def _exec_repeat(st: Repeat, env: Env, io: IOHandler, debugger=None):
+    if not debugger and _run_kernel(st, env):
+        return
+    while True:
+        exec_statements(st.body, env, io, debugger=debugger)
+        if _EXPR_DISPATCH[st.cond.OP](st.cond, env, io, debugger):
+            break
+
+def _exec_select(st: Select, env: Env, io: IOHandler, debugger=None):
+    target = eval_expr(st.expr, env, io, debugger)
+    table = st.table
+    if table is not None:
+        try:
+            body = table.get(target)
+        except TypeError:
+            body = None  # unhashable value: no literal case can equal it
+        if body is None:
+            body = st.default
+        if body is not None:
+            exec_statements(body, env, io, debugger=debugger)
+        return
+    matched = False
+    for values, body in st.cases:
+        for val_expr in values:
+            if eval_expr(val_expr, env, io, debugger) == target:
+                exec_statements(body, env, io, debugger=debugger)
+                matched = True
                 break
-        if not matched and st.default is not None:
-            exec_statements(st.default, env, io, debugger=debugger)
-    elif isinstance(st, ProcCall):
+        if matched:
+            break
+    if not matched and st.default is not None:
+        exec_statements(st.default, env, io, debugger=debugger)
+
+def _exec_proc_call(st: ProcCall, env: Env, io: IOHandler, debugger=None):
+    target = st.target
+    if target is not None:
+        invoke_procedure(target, st.args, env, io, debugger)
+    else:
         call_procedure(st.name, st.args, env, io, debugger)
-    elif isinstance(st, Return):
-        value = eval_expr(st.expr, env, io, debugger) if st.expr is not None else None
-        raise FunctionReturn(value)
-    elif isinstance(st, For):
-        start = eval_expr(st.start, env, io, debugger)
-        end = eval_expr(st.end, env, io, debugger)
-        step = eval_expr(st.step, env, io, debugger) if st.step is not None else 1
-        env.set(st.var, start)
+
+def _exec_return(st: Return, env: Env, io: IOHandler, debugger=None):
+    value = eval_expr(st.expr, env, io, debugger) if st.expr is not None else None
+    raise FunctionReturn(value)
+
+def _exec_for(st: For, env: Env, io: IOHandler, debugger=None):
+    # Without a debugger, numeric loops run as compiled Python functions
+    if not debugger and st.slot is not None and _run_kernel(st, env):
+        return
+    start = eval_expr(st.start, env, io, debugger)
+    end = eval_expr(st.end, env, io, debugger)
+    step = eval_expr(st.step, env, io, debugger) if st.step is not None else 1
+    slot = st.slot
+    if slot is not None:
+        # A local scalar counter: work on the value list directly. The counter
+        # is re-read after each pass since the body may assign to it.
+        values = env.values
+        coerce = env.coercers[slot]
+        values[slot] = coerce(start)
+        body = st.body
         if step >= 0:
-            while env.get(st.var) <= end:
-                exec_statements(st.body, env, io, debugger=debugger)
-                env.set(st.var, env.get(st.var)+step)
+            while values[slot] <= end:
+                exec_statements(body, env, io, debugger=debugger)
+                values[slot] = coerce(values[slot] + step)
         else:
-            while env.get(st.var) >= end:
-                exec_statements(st.body, env, io, debugger=debugger)
-                env.set(st.var, env.get(st.var)+step)
+            while values[slot] >= end:
+                exec_statements(body, env, io, debugger=debugger)
+                values[slot] = coerce(values[slot] + step)
+        return
+    # Loop variable not declared locally: fall back to lookup by name
+    owner = env._find_owner(st.var)
+    if owner is None:
+        raise RuntimeErrorGlossa(f"Άγνωστη μεταβλητή '{st.var}'")
+    slot = owner.slots[st.var]
+    owner.set_slot(slot, start)
+    if step >= 0:
+        while owner.get_slot(slot) <= end:
+            exec_statements(st.body, env, io, debugger=debugger)
+            owner.set_slot(slot, owner.get_slot(slot)+step)
     else:
-        raise RuntimeErrorGlossa(f"Μη υποστηριζόμενη εντολή στη γραμμή {st.line}")
+        while owner.get_slot(slot) >= end:
+            exec_statements(st.body, env, io, debugger=debugger)
+            owner.set_slot(slot, owner.get_slot(slot)+step)
+
+def _exec_unsupported(st: ASTNode, env: Env, io: IOHandler, debugger=None):
+    raise RuntimeErrorGlossa(f"Μη υποστηριζόμενη εντολή στη γραμμή {st.line}")
+
+# Statement handlers per node class, laid out by OP in _STMT_DISPATCH
+_STMT_HANDLERS = {
+    Assign: _exec_assign,
+    Write: _exec_write,
+    Read: _exec_read,
+    If: _exec_if,
+    While: _exec_while,
+    Repeat: _exec_repeat,
+    Select: _exec_select,
+    ProcCall: _exec_proc_call,
+    Return: _exec_return,
+    For: _exec_for,
+}
+_STMT_DISPATCH = dispatch_table(_STMT_HANDLERS, _exec_unsupported)
+
+# -------------------- Loop compiler --------------------
+
+class _NotCompilable(Exception):
+    """Raised while translating a loop that uses something the compiler does not cover."""
+
+class LoopCompiler:
+    """Translate a numeric loop into an equivalent native Python function.
+
+    Only ΓΙΑ, ΟΣΟ and ΜΕΧΡΙΣ_ΟΤΟΥ loops whose bodies consist of assignments,
+    nested loops and ΑΝ statements over ΑΚΕΡΑΙΕΣ/ΠΡΑΓΜΑΤΙΚΕΣ/ΛΟΓΙΚΕΣ locals and numeric arrays are
+    accepted. Every declared type is known from the scope, so each expression
+    has a static type and the generated code performs exactly the coercions,
+    bounds checks and error reports the interpreter would, without walking
+    the AST. Scalars live in Python locals and are written back to the Env
+    when the function exits, including when it exits with an error.
+    """
+
+    def __init__(self, env: Env):
+        self.env = env
+        self.lines: List[str] = []
+        self.ntemps = 0
+        self.scalars: Dict[int, int] = {}  # slot -> base type code
+        self.arrays: Dict[int, int] = {}
+        self.assigned: set = set()
+        # Slots of the enclosing ΑΚΕΡΑΙΑ ΓΙΑ counters; none of them is
+        # reassigned inside its own loop (see loop())
+        self.counters: set = set()
+        # (array slot, index position, counter slot, offset) whose bounds a
+        # guard in front of the current loop has already checked
+        self.in_range: set = set()
+
+    def compile(self, st: Union[For, While, Repeat]):
+        """Return ``kernel(values)`` running *st* against an Env's value list."""
+        self.block([st], "        ")
+        body = self.lines
+        head = ["def _kernel(vals):"]
+        head += [f"    v{slot} = vals[{slot}]" for slot in self.scalars]
+        head += [f"    a{slot} = vals[{slot}]" for slot in self.arrays]
+        head.append("    try:")
+        tail = ["    finally:"]
+        tail += [f"        vals[{slot}] = v{slot}" for slot in sorted(self.assigned)]
+        if len(tail) == 1:
+            tail.append("        pass")
+        source = "\n".join(head + body + tail)
+        namespace = {"_RT": RuntimeErrorGlossa, "_coerce_index": _coerce_index, "_array": array}
+        exec(compile(source, f"<βρόχος γραμμή {st.line}>", "exec"), namespace)
+        return namespace["_kernel"]
+
+    def temp(self) -> str:
+        self.ntemps += 1
+        return f"t{self.ntemps}"
+
+    def emit(self, ind: str, code: str):
+        self.lines.append(ind + code)
+
+    def scalar(self, slot: Optional[int], store: bool) -> Tuple[str, int]:
+        env = self.env
+        if slot is None:
+            raise _NotCompilable()
+        base, dims = env.infos[slot]
+        if dims is not None or base == T_CHAR:
+            raise _NotCompilable()
+        if slot < env.nconsts and (store or env.names[slot] in env.types):
+            raise _NotCompilable()
+        self.scalars[slot] = base
+        if store:
+            self.assigned.add(slot)
+        return f"v{slot}", base
+
+    def convert(self, code: str, tp: int, target: int) -> str:
+        """Return *code* coerced from static type *tp* to declared type *target*."""
+        if tp == target:
+            return code
+        if target == T_INT:
+            return f"int({code})"
+        if target == T_REAL:
+            return f"float({code})"
+        raise _NotCompilable()
+
+    def element(self, node: ASTNode, line_of, ind: str) -> Tuple[str, str, int]:
+        """Emit index evaluation and bounds checks; return (array, offset, type)."""
+        env, slot = self.env, node.slot
+        if slot is None or slot < env.nconsts:
+            raise _NotCompilable()
+        base, dims = env.infos[slot]
+        if dims is None or base not in ARRAY_TYPECODES or len(node.indices) != len(dims):
+            raise _NotCompilable()
+        self.arrays[slot] = base
+        idx_codes = []
+        for idx in node.indices:
+            code, tp = self.expr(idx, ind)
+            if tp != T_INT:
+                t = self.temp()
+                self.emit(ind, f"{t} = _coerce_index({code}, {line_of(idx)})")
+                code = t
+            idx_codes.append(code)
+        msg = repr(f"Η πρόσβαση στον πίνακα '{env.names[slot]}' είναι εκτός ορίων")
+        for k, (code, size) in enumerate(zip(idx_codes, dims)):
+            form = _induction_index(node.indices[k])
+            if form is not None and (slot, k) + form in self.in_range:
+                continue
+            self.emit(ind, f"if {code} < 1 or {code} > {size}: raise _RT({msg})")
+        if len(dims) == 1:
+            offset = f"{idx_codes[0]} - 1"
+        else:
+            offset = f"({idx_codes[0]} - 1) * {dims[1]} + {idx_codes[1]} - 1"
+        return f"a{slot}", offset, base
+
+    def expr(self, node: ASTNode, ind: str) -> Tuple[str, int]:
+        """Emit code computing *node*; return the value's code and static type."""
+        kind = type(node)
+        if kind is Number:
+            return repr(node.value), (T_INT if type(node.value) is int else T_REAL)
+        if kind is Bool:
+            return repr(node.value), T_BOOL
+        if kind is Var:
+            return self.scalar(node.slot, store=False)
+        if kind is ArrayRef:
+            arr, offset, base = self.element(node, lambda idx: node.line, ind)
+            t = self.temp()
+            self.emit(ind, f"{t} = {arr}[{offset}]")
+            return t, base
+        if isinstance(node, UnOp):
+            code, tp = self.expr(node.expr, ind)
+            t = self.temp()
+            if node.op == "NOT":
+                self.emit(ind, f"{t} = not {code}")
+                return t, T_BOOL
+            if tp == T_BOOL:
+                raise _NotCompilable()
+            self.emit(ind, f"{t} = {'-' if node.op == 'MINUS' else '+'}{code}")
+            return t, tp
+        if isinstance(node, BinOp):
+            return self.binop(node, ind)
+        raise _NotCompilable()
+
+    def binop(self, node: BinOp, ind: str) -> Tuple[str, int]:
+        op = node.op
+        if op in ("AND", "OR"):
+            return self.logical(node, ind)
+        l, lt = self.expr(node.left, ind)
+        r, rt = self.expr(node.right, ind)
+        t = self.temp()
+        if lt == T_BOOL or rt == T_BOOL:
+            raise _NotCompilable()
+        both_int = lt == T_INT and rt == T_INT
+        if op in _LOOP_CMP_OPS:
+            self.emit(ind, f"{t} = {l} {_LOOP_CMP_OPS[op]} {r}")
+            return t, T_BOOL
+        if op in ("PLUS", "MINUS", "MUL"):
+            sym = {"PLUS": "+", "MINUS": "-", "MUL": "*"}[op]
+            self.emit(ind, f"{t} = {l} {sym} {r}")
+            return t, (T_INT if both_int else T_REAL)
+        # A non-zero literal divisor needs no runtime check
+        checked = not (type(node.right) is Number and node.right.value != 0)
+        if op == "DIVIDE":
+            if checked:
+                self.emit(ind, f"if {r} == 0: raise _RT('Διαίρεση με το μηδέν')")
+            self.emit(ind, f"{t} = {l} / {r}")
+            return t, T_REAL
+        if op in ("DIV", "MOD", "MOD_SYM"):
+            msg = "Διαίρεση με το μηδέν" if op == "DIV" else "Υπόλοιπο με το μηδέν"
+            sym = "//" if op == "DIV" else "%"
+            if checked:
+                self.emit(ind, f"if {r} == 0: raise _RT({msg!r})")
+            if both_int:
+                self.emit(ind, f"{t} = {l} {sym} {r}")
+            else:
+                self.emit(ind, f"{t} = int({l}) {sym} int({r})")
+            return t, T_INT
+        raise _NotCompilable()
+
+    def logical(self, node: BinOp, ind: str) -> Tuple[str, int]:
+        # The right operand's code goes under an if, so it only runs when needed
+        l, lt = self.expr(node.left, ind)
+        t = self.temp()
+        self.emit(ind, f"{t} = {l}" if lt == T_BOOL else f"{t} = bool({l})")
+        self.emit(ind, f"if {t}:" if node.op == "AND" else f"if not {t}:")
+        r, rt = self.expr(node.right, ind + "    ")
+        self.emit(ind + "    ", f"{t} = {r}" if rt == T_BOOL else f"{t} = bool({r})")
+        return t, T_BOOL
+
+    def block(self, stmts: List[ASTNode], ind: str):
+        if not stmts:
+            self.emit(ind, "pass")
+        for st in stmts:
+            kind = type(st)
+            if kind is Assign:
+                self.assign(st, ind)
+            elif kind is For:
+                self.loop(st, ind)
+            elif kind is If:
+                code, _ = self.expr(st.cond, ind)
+                self.emit(ind, f"if {code}:")
+                self.block(st.then_body, ind + "    ")
+                if st.else_body is not None:
+                    self.emit(ind, "else:")
+                    self.block(st.else_body, ind + "    ")
+            elif kind is While:
+                self.emit(ind, "while True:")
+                code, _ = self.expr(st.cond, ind + "    ")
+                self.emit(ind, f"    if not {code}: break")
+                self.block(st.body, ind + "    ")
+            elif kind is Repeat:
+                self.emit(ind, "while True:")
+                self.block(st.body, ind + "    ")
+                code, _ = self.expr(st.cond, ind + "    ")
+                self.emit(ind, f"    if {code}: break")
+            else:
+                raise _NotCompilable()
+
+    def assign(self, st: Assign, ind: str):
+        code, tp = self.expr(st.expr, ind)
+        if st.indices is None:
+            var, base = self.scalar(st.slot, store=True)
+            self.emit(ind, f"{var} = {self.convert(code, tp, base)}")
+            return
+        arr, offset, base = self.element(st, lambda idx: idx.line, ind)
+        value = self.convert(code, tp, base)
+        if base == T_INT:
+            # Convert first, so only the store itself can trigger widen()
+            t = self.temp()
+            self.emit(ind, f"{t} = {value}")
+            self.emit(ind, "try:")
+            self.emit(ind, f"    {arr}[{offset}] = {t}")
+            self.emit(ind, "except OverflowError:")
+            self.widen(st.slot, ind + "    ")
+            self.emit(ind, f"    {arr}[{offset}] = {t}")
+        else:
+            self.emit(ind, f"{arr}[{offset}] = {value}")
+
+    def widen(self, slot: int, ind: str):
+        """Emit the switch of an ΑΚΕΡΑΙΑ array to a list, as Env.set_slot does on overflow."""
+        self.emit(ind, f"a{slot} = vals[{slot}] = a{slot}.tolist()")
+
+    def loop(self, st: For, ind: str):
+        start, start_t = self.expr(st.start, ind)
+        end, end_t = self.expr(st.end, ind)
+        step, step_t = self.expr(st.step, ind) if st.step is not None else ("1", T_INT)
+        var, base = self.scalar(st.slot, store=True)
+        if base == T_BOOL or T_BOOL in (start_t, end_t, step_t):
+            raise _NotCompilable()
+        if any(isinstance(node, (Assign, For)) and node.slot == st.slot
+               for node in iter_nodes(st.body)):
+            # The body rebinds the counter; leave that to the interpreter
+            raise _NotCompilable()
+        self.emit(ind, f"{var} = {self.convert(start, start_t, base)}")
+        # The bound and step are evaluated once, before the first iteration
+        end_v, step_v = self.temp(), self.temp()
+        self.emit(ind, f"{end_v} = {end}")
+        self.emit(ind, f"{step_v} = {step}")
+        advance = self.convert(f"{var} + {step_v}", T_INT if base == T_INT and step_t == T_INT else T_REAL, base)
+        if base == T_INT:
+            self.counters.add(st.slot)
+        if st.step is None or type(st.step) is Number:
+            # Literal step: the direction is known now
+            upward = st.step is None or st.step.value >= 0
+            cmp = "<=" if upward else ">="
+            checks = self.hoistable(st, var, end_v, upward) if base == T_INT else {}
+            if checks:
+                # Every counter-indexed access is in range for the whole loop:
+                # test that once and run a copy of the loop without those checks
+                self.emit(ind, f"if {' and '.join(checks.values())}:")
+                self.in_range = set(checks)
+                target = self.fill_target(st)
+                if target is not None:
+                    self.fill(target, var, end_v, end_t, ind + "    ")
+                else:
+                    self.emit(ind, f"    while {var} {cmp} {end_v}:")
+                    self.block(st.body, ind + "        ")
+                    self.emit(ind, f"        {var} = {advance}")
+                self.in_range = set()
+                self.emit(ind, "else:")
+                ind += "    "
+            self.emit(ind, f"while {var} {cmp} {end_v}:")
+            self.block(st.body, ind + "    ")
+            self.emit(ind, f"    {var} = {advance}")
+            self.counters.discard(st.slot)
+            return
+        self.emit(ind, f"if {step_v} >= 0:")
+        self.emit(ind, f"    while {var} <= {end_v}:")
+        mark = len(self.lines)
+        self.block(st.body, ind + "        ")
+        body = self.lines[mark:]
+        self.emit(ind, f"        {var} = {advance}")
+        self.emit(ind, "else:")
+        self.emit(ind, f"    while {var} >= {end_v}:")
+        self.lines.extend(body)
+        self.emit(ind, f"        {var} = {advance}")
+        self.counters.discard(st.slot)
+
+    def fill_target(self, st: For) -> Optional[Assign]:
+        """Return the assignment of a ``ΓΙΑ i ... Α[i] <- expr`` loop, else None.
+
+        The array must be numeric, the step must be 1 and *expr* must not read
+        the array being filled, so the elements can be computed first and
+        stored with one slice.
+        """
+        if st.step is not None and not (type(st.step.value) is int and st.step.value == 1):
+            return None
+        if len(st.body) != 1:
+            return None
+        target = st.body[0]
+        if type(target) is not Assign or target.indices is None or len(target.indices) != 1:
+            return None
+        if _induction_index(target.indices[0]) != (st.slot, 0):
+            return None
+        if self.env.infos[target.slot][0] not in ARRAY_TYPECODES:
+            return None
+        if any(type(node) is ArrayRef and node.slot == target.slot for node in iter_nodes(target.expr)):
+            return None
+        return target
+
+    def fill(self, st: Assign, var: str, end_v: str, end_t: int, ind: str):
+        """Emit a bulk store for fill_target(); the counter ends as the loop would leave it."""
+        slot = st.slot
+        base = self.env.infos[slot][0]
+        self.arrays[slot] = base
+        arr, typecode = f"a{slot}", ARRAY_TYPECODES[base]
+        first, last = self.temp(), self.temp()
+        self.emit(ind, f"{first} = {var}")
+        self.emit(ind, f"{last} = {end_v if end_t == T_INT else f'int({end_v})'}")
+        mark = len(self.lines)
+        code, tp = self.expr(st.expr, ind + "        ")
+        value = self.convert(code, tp, base)
+        if len(self.lines) == mark and code != var:
+            # The value does not change between iterations: repeat it
+            count, t = self.temp(), self.temp()
+            self.emit(ind, f"{count} = max(0, {last} - {first} + 1)")
+            self.emit(ind, f"if {count}:")
+            self.emit(ind, f"    {t} = {value}")
+            target = f"{arr}[{first} - 1:{first} - 1 + {count}]"
+            if base == T_INT:
+                self.emit(ind, "    try:")
+                self.emit(ind, f"        {target} = _array({typecode!r}, [{t}]) * {count}")
+                self.emit(ind, "    except OverflowError:")
+                self.widen(slot, ind + "        ")
+                self.emit(ind, f"        {target} = [{t}] * {count}")
+            else:
+                self.emit(ind, f"    {target} = _array({typecode!r}, [{t}]) * {count}")
+            self.emit(ind, f"{var} = {first} + {count}")
+            return
+        # Collect the values, then store them at once. If an element fails,
+        # the ones before it are still stored and the counter is left on it.
+        rhs = self.lines[mark:]
+        del self.lines[mark:]
+        buf = self.temp()
+        self.emit(ind, f"{buf} = []")
+        self.emit(ind, "try:")
+        self.emit(ind, f"    for {var} in range({first}, {last} + 1):")
+        self.lines.extend(rhs)
+        self.emit(ind, f"        {buf}.append({value})")
+        self.emit(ind, "finally:")
+        self.emit(ind, f"    {var} = {first} + len({buf})")
+        target = f"{arr}[{first} - 1:{var} - 1]"
+        if base == T_INT:
+            self.emit(ind, "    try:")
+            self.emit(ind, f"        {target} = _array({typecode!r}, {buf})")
+            self.emit(ind, "    except OverflowError:")
+            # Some value needs more than 64 bits
+            self.widen(slot, ind + "        ")
+            self.emit(ind, f"        {target} = {buf}")
+        else:
+            self.emit(ind, f"    {target} = _array({typecode!r}, {buf})")
+
+    def hoistable(self, st: For, var: str, end_v: str, upward: bool) -> Dict[Tuple[int, int, int, int], str]:
+        """Map each bounds check that can move in front of *st* to its guard.
+
+        Only innermost loops are considered, so a loop is copied at most once.
+        An index of the form ``counter ± literal`` stays in range for the
+        whole loop when it does at the loop's first and last counter value;
+        the counters of enclosing loops do not change while *st* runs.
+        """
+        checks: Dict[Tuple[int, int, int, int], str] = {}
+        nodes = list(iter_nodes(st.body))
+        if any(isinstance(node, (For, While, Repeat)) for node in nodes):
+            return checks
+        env = self.env
+        lo, hi = (var, end_v) if upward else (end_v, var)
+        for node in nodes:
+            if type(node) is not ArrayRef and not (type(node) is Assign and node.indices is not None):
+                continue
+            slot = node.slot
+            if slot is None or slot < env.nconsts:
+                continue
+            dims = env.infos[slot][1]
+            if dims is None or len(node.indices) != len(dims):
+                continue
+            for k, idx in enumerate(node.indices):
+                form = _induction_index(idx)
+                if form is None:
+                    continue
+                counter, delta = form
+                if counter == st.slot:
+                    first, last = lo, hi
+                elif counter in self.counters:
+                    first = last = f"v{counter}"
+                else:
+                    continue
+                shift = f" + {delta}" if delta else ""
+                checks[(slot, k, counter, delta)] = f"{first}{shift} >= 1 and {last}{shift} <= {dims[k]}"
+        return checks
+
+def _induction_index(idx: ASTNode) -> Optional[Tuple[int, int]]:
+    """Return (slot, offset) when *idx* is a local variable plus or minus an integer literal."""
+    if type(idx) is Var:
+        return (idx.slot, 0) if idx.slot is not None else None
+    add = isinstance(idx, AddOp)
+    if add or isinstance(idx, SubOp):
+        left, right = idx.left, idx.right
+        if type(left) is Var and left.slot is not None and type(right) is Number and type(right.value) is int:
+            return left.slot, (right.value if add else -right.value)
+        if add and type(right) is Var and right.slot is not None and type(left) is Number and type(left.value) is int:
+            return right.slot, left.value
+    return None
+
+_LOOP_CMP_OPS = {"EQ": "==", "NE": "!=", "LT": "<", "LE": "<=", "GT": ">", "GE": ">="}
+
+def compile_loop(st: Union[For, While, Repeat], env: Env):
+    """Return a native kernel for *st* in scopes shaped like *env*, or None."""
+    try:
+        return LoopCompiler(env).compile(st)
+    except _NotCompilable:
+        return None
 
 def compile_and_run(source: str, inputs: Optional[List[str]] = None) -> List[str]:
     """Convenience helper that lexes, parses, and executes *source*."""
     tokens = lex(source)
     parser = Parser(tokens)
     prog = parser.parse()
-    env = Env(prog.var_decls, procedures=prog.procedures, functions=prog.functions, const_decls=prog.const_decls)
+    env = Env.for_program(prog)
     io = IOHandler(inputs)
     try:
         exec_statements(prog.statements, env, io)
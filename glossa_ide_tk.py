@@ -16,6 +16,9 @@ from tkinter import font as tkfont
 import re
 import os
 import sys
+import time
+from bisect import bisect_right
+from functools import partial
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 if BASE_DIR not in sys.path:
@@ -24,6 +27,49 @@ if BASE_DIR not in sys.path:
 import glossa_compiler as glossa
 
 KEYWORDS = list(glossa.KEYWORDS.keys())
+KEYWORDS_BY_LEN = sorted(KEYWORDS, key=len, reverse=True)
+# Highlighter patterns, compiled once: all keywords as one alternation
+# (longest first), strings "..." or «...», and comments from ! to end of line
+KEYWORD_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, KEYWORDS_BY_LEN)) + r')\b')
+STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|«[^»]*»')
+COMMENT_RE = re.compile(r'!.*')
+# Text tags applied by the syntax highlighter
+SYNTAX_TAGS = ("kw", "str", "com")
+# Line number inside compiler error messages ("... γραμμή 12 ...")
+ERROR_LINE_RE = re.compile(r"γραμμή\s+(\d+)")
+# Lines highlighted above and below the viewport, so short scrolls find them ready
+HIGHLIGHT_MARGIN = 20
+# Lines tagged per idle tick while a freshly opened file is highlighted
+HIGHLIGHT_CHUNK = 200
+# Buffers longer than this get syntax highlighting switched off (toolbar toggle)
+HIGHLIGHT_MAX_LINES = 2000
+# Quiet time (ms) after an edit before highlighting and line numbers are refreshed
+EDIT_REFRESH_DELAY = 30
+# Characters read and inserted at a time when opening a file
+READ_CHUNK = 65536
+# Seconds between watch panel refreshes while the debugger runs in continue mode
+WATCH_REFRESH_INTERVAL = 0.1
+
+def index_converter(text, base_index):
+    """Return a function mapping character offsets in *text* to Tk ``line.col`` indices.
+
+    *text* is the widget content starting at *base_index*. Tk resolves
+    ``line.col`` directly, whereas ``base+Nc`` is counted char by char.
+    """
+    first_line, first_col = map(int, base_index.split('.'))
+    line_starts = [0]
+    pos = text.find('\n')
+    while pos >= 0:
+        line_starts.append(pos + 1)
+        pos = text.find('\n', pos + 1)
+
+    def to_index(offset):
+        row = bisect_right(line_starts, offset) - 1
+        col = offset - line_starts[row]
+        if row == 0:
+            col += first_col
+        return f"{first_line + row}.{col}"
+    return to_index
 
 class GUIIO(glossa.IOHandler):
     """tkinter-aware IO layer that redirects runtime output to the console."""
@@ -33,17 +79,32 @@ class GUIIO(glossa.IOHandler):
         super().__init__(input_queue=None)
         self.output_widget = output_widget
         self.outputs = []  # keep a list too
+        self.pending = []  # lines not yet shown in the widget
+        self.flush_scheduled = False
 
     def write(self, text: str):
-        """Append a line to both the stored transcript and the GUI widget."""
+        """Append a line to the stored transcript and queue it for the GUI widget."""
         self.outputs.append(text)
+        self.pending.append(text + "\n")
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.output_widget.after_idle(self.flush)
+
+    def flush(self):
+        """Show all queued lines in the widget with a single insert."""
+        self.flush_scheduled = False
+        if not self.pending:
+            return
+        text = "".join(self.pending)
+        self.pending.clear()
         self.output_widget.config(state='normal')
-        self.output_widget.insert('end', text + "\n")
+        self.output_widget.insert('end', text)
         self.output_widget.see('end')
         self.output_widget.config(state='disabled')
 
     def read(self) -> str:
         """Prompt the user when ΔΙΑΒΑΣΕ is encountered during execution."""
+        self.flush()
         resp = simpledialog.askstring("Είσοδος", "Δώσε τιμή (ΔΙΑΒΑΣΕ):")
         if resp is None:
             raise glossa.RuntimeErrorGlossa("Η είσοδος ακυρώθηκε από τον χρήστη")
@@ -59,12 +120,10 @@ class TkDebuggerHook:
 
     def __init__(self, app: "GlossaIDE"):
         self.app = app
-
-    def before_statement(self, stmt, env):
-        self.app.debug_before_statement(stmt, env)
-
-    def after_statement(self, stmt, env):
-        self.app.debug_after_statement(stmt, env)
+        # The interpreter calls these per statement; bind the IDE methods
+        # directly instead of forwarding through another call
+        self.before_statement = app.debug_before_statement
+        self.after_statement = app.debug_after_statement
 
 
 class GlossaIDE(tk.Tk):
@@ -91,6 +150,8 @@ class GlossaIDE(tk.Tk):
         tk.Button(toolbar, text="Βήμα", command=self.debug_step).pack(side='left')
         tk.Button(toolbar, text="Συνέχεια", command=self.debug_continue).pack(side='left')
         tk.Button(toolbar, text="Διακοπή", command=self.debug_stop).pack(side='left')
+        self.highlight_button = tk.Button(toolbar, text="Επισήμανση: ON", command=self.toggle_highlighting)
+        self.highlight_button.pack(side='left')
 
         # Paned editor/console
         self.paned = tk.PanedWindow(self, orient='vertical')
@@ -148,7 +209,23 @@ class GlossaIDE(tk.Tk):
         self.editor.tag_configure("debug_line", background="#fff3b0", foreground="#c00000")
         self.editor.tag_configure("error_line", background="#ffd6d6")
 
-        self.editor.bind("<KeyRelease>", self.on_key_release)
+        self.editor.bind("<KeyPress>", self.remember_edit_start)
+        self.editor.bind("<ButtonRelease-1>", self.remember_edit_start)
+        self.editor.bind("<<Modified>>", self.on_modified)
+        self.editor.bind("<Configure>", self.schedule_highlight)
+
+        # Syntax highlighting covers only the viewport; these lines are tagged already
+        self.highlighted_lines = set()
+        self.highlight_line_count = 0
+        self.highlight_scheduled = False
+        self.highlight_disabled = False
+        # First line the next edit can touch, and the line count shown in the gutter
+        self.edit_start_line = 1
+        self.line_number_count = 0
+        # Lines (first, last) edited since the last refresh, and the queued refresh
+        self.pending_edit = None
+        self.edit_refresh_job = None
+        self.highlight_chunk_job = None
 
         # Starter template
         template = """ΠΡΟΓΡΑΜΜΑ Παράδειγμα
@@ -163,8 +240,8 @@ class GlossaIDE(tk.Tk):
     ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
 ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
 """
-        self.editor.insert("1.0", template)
-        self.highlight_all()
+        self.load_text((template,))
+        self.reset_highlighting()
         self.update_line_numbers()
 
         self.current_file = None
@@ -175,6 +252,12 @@ class GlossaIDE(tk.Tk):
         self.debug_hook = None
         self.debug_env = None
         self.debug_prog = None
+        self.watch_text = None
+        self.last_watch_time = 0.0
+        self.pending_debug_line = None
+        self.output_io = None
+        # (source, Program) of the last successful parse
+        self.compile_cache = (None, None)
         self.update_watch(None)
         self.update_window_title()
         
@@ -250,55 +333,168 @@ class GlossaIDE(tk.Tk):
             widget.tag_add("sel", "1.0", "end")
             return "break"
 
-    def on_key_release(self, event):
-        """Refresh syntax highlighting when edits occur."""
-        self.highlight_line(self.editor.index("insert linestart"), self.editor.index("insert lineend"))
+    def load_text(self, chunks):
+        """Replace the buffer with the text pieces in *chunks*, leaving no undo history."""
+        # Journaling a large insert for undo is slow and the load is not an edit
+        self.editor.config(undo=False)
+        try:
+            self.editor.delete("1.0", "end")
+            for chunk in chunks:
+                self.editor.insert("end", chunk)
+                # Redraw between pieces so a large file does not block in one insert
+                self.update_idletasks()
+        finally:
+            self.editor.config(undo=True)
+        self.editor.edit_reset()
+        self.editor.edit_modified(False)
+        self.edit_start_line = 1
+
+    def remember_edit_start(self, event=None):
+        """Record where the next edit begins: the cursor or the start of the selection."""
+        line = int(self.editor.index("insert").split('.')[0])
+        if self.editor.tag_ranges("sel"):
+            line = min(line, int(self.editor.index("sel.first").split('.')[0]))
+        self.edit_start_line = line
+
+    def on_modified(self, event=None):
+        """Note the lines between the edit start and the cursor and queue a refresh.
+
+        A burst of keystrokes keeps pushing the refresh back, so it runs once
+        typing pauses for EDIT_REFRESH_DELAY ms.
+        """
+        # Clearing the flag below fires <<Modified>> again; ignore that one
+        if not self.editor.edit_modified():
+            return
+        self.editor.edit_modified(False)
+        line = int(self.editor.index("insert").split('.')[0])
+        first, last = sorted((self.edit_start_line, line))
+        if self.pending_edit is not None:
+            first = min(first, self.pending_edit[0])
+            last = max(last, self.pending_edit[1])
+        self.pending_edit = (first, last)
+        self.edit_start_line = line
+        if self.edit_refresh_job is not None:
+            self.after_cancel(self.edit_refresh_job)
+        self.edit_refresh_job = self.after(EDIT_REFRESH_DELAY, self.refresh_after_edit)
+
+    def refresh_after_edit(self):
+        """Re-highlight the lines edited since the last refresh and update the gutter."""
+        self.edit_refresh_job = None
+        first, last = self.pending_edit
+        self.pending_edit = None
+        total_lines = int(self.editor.index('end-1c').split('.')[0])
+        if total_lines != self.highlight_line_count:
+            if not self.highlight_disabled and self.highlight_line_count <= HIGHLIGHT_MAX_LINES < total_lines:
+                # A large paste: treat it like opening a large file
+                self.set_highlighting(False)
+            # Lines were added or removed, so the remembered line numbers moved
+            self.highlighted_lines.clear()
+            self.highlight_line_count = total_lines
+            self.schedule_highlight()
+        if not self.highlight_disabled:
+            first, last = min(first, total_lines), min(last, total_lines)
+            self.highlight_line(f"{first}.0", self.editor.index(f"{last}.0 lineend"))
+            self.highlighted_lines.update(range(first, last + 1))
         self.update_line_numbers()
 
-    def highlight_all(self):
-        """Apply syntax highlighting tags across the entire buffer."""
-        text = self.editor.get("1.0", "end-1c")
-        self.editor.tag_remove("kw", "1.0", "end")
-        self.editor.tag_remove("str", "1.0", "end")
-        self.editor.tag_remove("com", "1.0", "end")
-        # Strings: "..." or «...»
-        for m in re.finditer(r'"[^"\\]*(?:\\.[^"\\]*)*"|«[^»]*»', text):
-            self.editor.tag_add("str", f"1.0+{m.start()}c", f"1.0+{m.end()}c")
-        # Comments: ! to end of line
-        for m in re.finditer(r'!.*', text):
-            self.editor.tag_add("com", f"1.0+{m.start()}c", f"1.0+{m.end()}c")
-        # Keywords (whole words)
-        for kw in sorted(KEYWORDS, key=len, reverse=True):
-            for m in re.finditer(rf'\b{re.escape(kw)}\b', text):
-                self.editor.tag_add("kw", f"1.0+{m.start()}c", f"1.0+{m.end()}c")
+    def set_highlighting(self, enabled):
+        """Switch syntax highlighting on or off and show the state on the toolbar."""
+        self.highlight_disabled = not enabled
+        self.highlight_button.config(text="Επισήμανση: ON" if enabled else "Επισήμανση: OFF")
+        self.reset_highlighting()
+
+    def toggle_highlighting(self):
+        """Toolbar handler: flip syntax highlighting; turning it on tags the viewport."""
+        self.set_highlighting(self.highlight_disabled)
+
+    def reset_highlighting(self):
+        """Drop all syntax tags and queued highlight work; the viewport is redone when idle."""
+        if self.edit_refresh_job is not None:
+            self.after_cancel(self.edit_refresh_job)
+            self.edit_refresh_job = None
+        self.pending_edit = None
+        if self.highlight_chunk_job is not None:
+            self.after_cancel(self.highlight_chunk_job)
+            self.highlight_chunk_job = None
+        self.remove_syntax_tags("1.0", "end")
+        self.highlighted_lines.clear()
+        self.schedule_highlight()
+
+    def schedule_highlight(self, event=None):
+        """Highlight the viewport once Tk is idle, at most once per burst of events."""
+        if not self.highlight_scheduled:
+            self.highlight_scheduled = True
+            self.after_idle(self.highlight_visible)
+
+    def highlight_visible(self):
+        """Highlight the visible lines, plus a margin, that are not tagged yet."""
+        self.highlight_scheduled = False
+        first = int(self.editor.index("@0,0").split('.')[0])
+        last = int(self.editor.index(f"@0,{self.editor.winfo_height()}").split('.')[0])
+        self.highlight_untagged(first - HIGHLIGHT_MARGIN, last + HIGHLIGHT_MARGIN)
+
+    def highlight_chunk(self, line):
+        """Highlight HIGHLIGHT_CHUNK lines from *line* on, then queue the next chunk."""
+        if self.highlight_disabled:
+            self.highlight_chunk_job = None
+            return
+        last = line + HIGHLIGHT_CHUNK - 1
+        total_lines = self.highlight_untagged(line, last)
+        if last < total_lines:
+            self.highlight_chunk_job = self.after_idle(self.highlight_chunk, last + 1)
+        else:
+            self.highlight_chunk_job = None
+
+    def highlight_untagged(self, first, last):
+        """Highlight the lines in [first, last] that are not tagged yet; return the line count."""
+        total_lines = int(self.editor.index('end-1c').split('.')[0])
+        if total_lines != self.highlight_line_count:
+            # Lines were added or removed since the last pass, so the remembered numbers moved
+            self.highlighted_lines.clear()
+            self.highlight_line_count = total_lines
+        if self.highlight_disabled:
+            return total_lines
+        line = max(1, first)
+        last = min(total_lines, last)
+        while line <= last:
+            if line in self.highlighted_lines:
+                line += 1
+                continue
+            # Highlight each run of untagged lines with one call
+            run_end = line
+            while run_end < last and run_end + 1 not in self.highlighted_lines:
+                run_end += 1
+            self.highlight_line(f"{line}.0", self.editor.index(f"{run_end}.0 lineend"))
+            self.highlighted_lines.update(range(line, run_end + 1))
+            line = run_end + 1
+        return total_lines
 
     def highlight_line(self, start, end):
         """Re-highlight a specific line range."""
-        self.editor.tag_remove("kw", start, end)
-        self.editor.tag_remove("str", start, end)
-        self.editor.tag_remove("com", start, end)
+        self.remove_syntax_tags(start, end)
         line_text = self.editor.get(start, end)
         base_index = self.editor.index(start)
-        line_start_idx = self.index_to_offset("1.0", start)
-        # Strings
-        for m in re.finditer(r'"[^"\\]*(?:\\.[^"\\]*)*"|«[^»]*»', line_text):
-            self.editor.tag_add("str", f"{start}+{m.start()}c", f"{start}+{m.end()}c")
-        # Comments
-        m = re.search(r'!.*', line_text)
-        if m:
-            self.editor.tag_add("com", f"{start}+{m.start()}c", f"{start}+{m.end()}c")
-        # Keywords
-        for kw in sorted(KEYWORDS, key=len, reverse=True):
-            for m in re.finditer(rf'\b{re.escape(kw)}\b', line_text):
-                self.editor.tag_add("kw", f"{start}+{m.start()}c", f"{start}+{m.end()}c")
-
-    def index_to_offset(self, start, idx):
-        """Placeholder helper kept for future enhancements."""
-        return 0
+        to_index = index_converter(line_text, base_index)
+        # Tk's "tag add" takes any number of index pairs: one call per tag
+        for tag, pattern in (("str", STRING_RE), ("com", COMMENT_RE), ("kw", KEYWORD_RE)):
+            ranges = []
+            for m in pattern.finditer(line_text):
+                ranges.append(to_index(m.start()))
+                ranges.append(to_index(m.end()))
+            if ranges:
+                self.editor.tag_add(tag, *ranges)
+
+    def remove_syntax_tags(self, start, end):
+        """Remove every highlighter tag from *start* to *end* in one Tcl call."""
+        # "tag remove" takes a single tag, so loop on the Tcl side instead of
+        # paying a Python-to-Tcl round trip per tag
+        self.tk.call("foreach", "tag", SYNTAX_TAGS,
+                     f"{self.editor} tag remove $tag {{{start}}} {{{end}}}")
 
     def on_editor_scroll(self, *args):
         self.editor_scrollbar.set(*args)
         self.line_numbers.yview_moveto(args[0])
+        self.schedule_highlight()
 
     def on_scrollbar(self, *args):
         self.editor.yview(*args)
@@ -306,10 +502,17 @@ class GlossaIDE(tk.Tk):
 
     def update_line_numbers(self):
         total_lines = int(self.editor.index('end-1c').split('.')[0])
-        content = "\n".join(str(i) for i in range(1, total_lines + 1))
+        shown = self.line_number_count
+        if total_lines == shown:
+            return
+        self.line_number_count = total_lines
+        # Only the numbers past the shorter of the old and new counts change
         self.line_numbers.config(state='normal')
-        self.line_numbers.delete('1.0', 'end')
-        self.line_numbers.insert('1.0', content)
+        if total_lines > shown:
+            content = "\n".join(str(i) for i in range(shown + 1, total_lines + 1))
+            self.line_numbers.insert('end-1c', "\n" + content if shown else content)
+        else:
+            self.line_numbers.delete(f"{total_lines}.0 lineend", 'end')
         self.line_numbers.config(state='disabled')
         first, _ = self.editor.yview()
         self.line_numbers.yview_moveto(first)
@@ -328,31 +531,37 @@ class GlossaIDE(tk.Tk):
     def highlight_error_from_message(self, message):
         if not message:
             return
-        match = re.search(r"γραμμή\s+(\d+)", str(message))
+        match = ERROR_LINE_RE.search(str(message))
         if match:
             self.highlight_error_line(int(match.group(1)))
 
     def prepare_output(self):
         """Clear the runtime console."""
         self.clear_error_highlight()
+        if self.output_io is not None:
+            self.output_io.pending.clear()
         self.output.config(state='normal')
         self.output.delete("1.0", "end")
         self.output.config(state='disabled')
 
     def update_watch(self, env):
         """Populate the watch panel with the current environment values."""
-        self.watch.config(state='normal')
-        self.watch.delete("1.0", "end")
         if not env:
-            self.watch.insert("1.0", "(χωρίς δεδομένα)")
-            self.watch.config(state='disabled')
+            self.show_watch_text("(χωρίς δεδομένα)")
             return
         lines = []
         current = env
         while current:
             prefix = "[L]" if current is env else "[G]"
             for name in sorted(current.types.keys()):
-                value = current.values.get(name)
+                value = current.values[current.slots[name]]
+                dims = current.types[name][1]
+                if dims is not None:
+                    # Arrays are stored flat; show 2D ones row by row
+                    value = list(value)
+                    if len(dims) == 2:
+                        cols = dims[1]
+                        value = [value[r * cols:(r + 1) * cols] for r in range(dims[0])]
                 if isinstance(value, bool):
                     display = "ΑΛΗΘΗΣ" if value else "ΨΕΥΔΗΣ"
                 else:
@@ -361,7 +570,17 @@ class GlossaIDE(tk.Tk):
             current = getattr(current, "parent", None)
         if not lines:
             lines.append("(χωρίς μεταβλητές)")
-        self.watch.insert("1.0", "\n".join(lines))
+        self.show_watch_text("\n".join(lines))
+
+    def show_watch_text(self, text):
+        """Replace the watch panel contents unless they already read *text*."""
+        # Most statements change no variable; skip rewriting the widget then
+        if text == self.watch_text:
+            return
+        self.watch_text = text
+        self.watch.config(state='normal')
+        self.watch.delete("1.0", "end")
+        self.watch.insert("1.0", text)
         self.watch.config(state='disabled')
 
     def clear_debug_highlight(self):
@@ -409,10 +628,8 @@ class GlossaIDE(tk.Tk):
         self.clear_debug_highlight()
         src = self.editor.get("1.0", "end-1c")
         try:
-            tokens = glossa.lex(src)
-            parser = glossa.Parser(tokens)
-            prog = parser.parse()
-            env = glossa.Env(prog.var_decls, procedures=prog.procedures, functions=prog.functions, const_decls=prog.const_decls)
+            prog = self.compile_source(src)
+            env = glossa.Env.for_program(prog)
         except glossa.LexerError as e:
             self.append_out(f"Σφάλμα αναλυτή (Lexer): {e}")
             self.highlight_error_from_message(e)
@@ -421,7 +638,7 @@ class GlossaIDE(tk.Tk):
             self.append_out(f"Σφάλμα σύνταξης: {e}")
             self.highlight_error_from_message(e)
             return
-        io = GUIIO(self.output)
+        io = self.output_io = GUIIO(self.output)
         self.debug_env = env
         self.debug_prog = prog
         self.debug_continue_mode = continue_mode
@@ -448,11 +665,30 @@ class GlossaIDE(tk.Tk):
         """Handle the callback before each statement executes."""
         if self.debug_stop_requested:
             raise DebugStop()
-        self.highlight_debug_line(getattr(stmt, "line", None))
+        line = getattr(stmt, "line", None)
+        if self.debug_continue_mode:
+            # Nobody follows the cursor at full speed: only remember the line,
+            # and service the window a few times a second
+            self.pending_debug_line = line
+            now = time.monotonic()
+            if now - self.last_watch_time <= WATCH_REFRESH_INTERVAL:
+                return
+            self.last_watch_time = now
+            if env is not None:
+                self.update_watch(env)
+            self.output_io.flush()
+            # Repaint and let Βήμα/Διακοπή flip their flags; they are read here
+            self.update()
+            if self.debug_stop_requested:
+                raise DebugStop()
+            if self.debug_continue_mode:
+                return
+            # Βήμα was pressed: pause on this statement
+        self.pending_debug_line = None
+        self.highlight_debug_line(line)
         if env is not None:
             self.update_watch(env)
-        if self.debug_continue_mode:
-            return
+        self.output_io.flush()
         self.debug_wait_var.set(False)
         self.wait_variable(self.debug_wait_var)
         if self.debug_stop_requested:
@@ -460,11 +696,17 @@ class GlossaIDE(tk.Tk):
 
     def debug_after_statement(self, stmt, env):
         """Update watch panel after each statement completes."""
+        if self.debug_continue_mode:
+            return
         if env is not None:
             self.update_watch(env)
 
     def debug_finish(self):
         """Reset debugger state after a session completes."""
+        # Continue mode throttles the watch panel; show the final values
+        if self.debug_env is not None:
+            self.update_watch(self.debug_env)
+        stopped = self.debug_stop_requested
         self.debug_active = False
         self.debug_continue_mode = False
         self.debug_stop_requested = False
@@ -473,6 +715,10 @@ class GlossaIDE(tk.Tk):
         self.debug_env = None
         self.debug_wait_var.set(True)
         self.clear_debug_highlight()
+        if stopped and self.pending_debug_line is not None:
+            # Show where a run in continue mode was stopped
+            self.highlight_debug_line(self.pending_debug_line)
+        self.pending_debug_line = None
 
     def open_file(self):
         """Open a Glossa file and load it into the editor."""
@@ -482,12 +728,23 @@ class GlossaIDE(tk.Tk):
             initialdir=initial_dir,
             filetypes=[("Glossa files","*.gls *.txt *.psc"),("All files","*.*")])
         if not path: return
-        with open(path, "r", encoding="utf-8") as f:
-            data = f.read()
-        self.editor.delete("1.0","end")
-        self.editor.insert("1.0", data)
-        self.highlight_all()
+        # Read and decode everything before the buffer is touched, so a bad
+        # file leaves the current text and path as they were. Text mode
+        # decodes incrementally, so no piece splits a Greek character.
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                chunks = list(iter(partial(f.read, READ_CHUNK), ""))
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Άνοιγμα", f"Το αρχείο δεν μπορεί να ανοιχτεί:\n{e}")
+            return
+        self.load_text(chunks)
+        self.compile_cache = (None, None)
+        total_lines = int(self.editor.index('end-1c').split('.')[0])
+        self.set_highlighting(total_lines <= HIGHLIGHT_MAX_LINES)
         self.update_line_numbers()
+        if not self.highlight_disabled:
+            # The viewport is tagged first; the rest follows a chunk per idle tick
+            self.highlight_chunk_job = self.after_idle(self.highlight_chunk, 1)
         self.current_file = path
         self.update_window_title()
 
@@ -527,11 +784,9 @@ class GlossaIDE(tk.Tk):
         self.clear_debug_highlight()
         self.update_watch(None)
         try:
-            tokens = glossa.lex(src)
-            parser = glossa.Parser(tokens)
-            prog = parser.parse()
-            env = glossa.Env(prog.var_decls, procedures=prog.procedures, functions=prog.functions, const_decls=prog.const_decls)
-            io = GUIIO(self.output)
+            prog = self.compile_source(src)
+            env = glossa.Env.for_program(prog)
+            io = self.output_io = GUIIO(self.output)
             try:
                 glossa.exec_statements(prog.statements, env, io)
             except glossa.FunctionReturn:
@@ -548,8 +803,24 @@ class GlossaIDE(tk.Tk):
         except Exception as e:
             self.append_out(f"Άγνωστο σφάλμα: {e}")
 
+    def compile_source(self, src):
+        """Return the program for *src*, reusing the last parse when the text is unchanged.
+
+        Running a Program only caches derived data on it (loop kernels, call
+        frames, memo tables), so it can be run again as is; edit-run cycles
+        that do not touch the buffer skip lexing and parsing altogether.
+        """
+        cached_src, prog = self.compile_cache
+        if src != cached_src:
+            prog = glossa.parse_cached(src)
+            self.compile_cache = (src, prog)
+        return prog
+
     def append_out(self, text):
         """Append text to the console widget, scrolling as needed."""
+        # Program output still queued by GUIIO comes first
+        if self.output_io is not None:
+            self.output_io.flush()
         self.output.config(state='normal')
         self.output.insert('end', str(text) + "\n")
         self.output.see('end')